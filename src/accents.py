@@ -0,0 +1,68 @@
+import unicodedata
+import numpy as np
+import caches
+import functions
+import snapshot
+
+# modo sem acentos: índice da chave sem acentos (ex: "abafa") para as palavras
+# do dicionário que viram essa chave ("abafa", "abafá"), ordenado para busca binária
+
+def fold(word):
+    decomposed = unicodedata.normalize("NFD", word)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+class FoldedIndex:
+    def __init__(self, words):
+        self.words = words
+        matrix = functions.encode_words(words)
+        # dobra só os caracteres distintos e aplica a tabela na matriz inteira
+        chars, inverse = np.unique(matrix, return_inverse=True)
+        folded_chars = np.array([ord(fold(chr(c))[:1] or chr(c)) for c in chars], dtype=np.uint32)
+        folded = folded_chars[inverse.ravel()].reshape(matrix.shape)
+        self.length = matrix.shape[1]
+        key = f"S{self.length * 4}"
+        folded_keys = np.ascontiguousarray(folded.astype(">u4")).view(key).ravel()
+        word_keys = np.ascontiguousarray(matrix.astype(">u4")).view(key).ravel()
+        # variantes da mesma chave ficam na ordem dos code points ("abafa" antes de "abafá")
+        self.order = np.lexsort((word_keys, folded_keys))
+        self.keys = folded_keys[self.order]
+
+    def variants(self, user_word):
+        folded = fold(user_word.lower())
+        if len(folded) != self.length:
+            return []
+        key = folded.encode("utf-32-be")
+        start = np.searchsorted(self.keys, key, side="left")
+        end = np.searchsorted(self.keys, key, side="right")
+        result = []
+        for i in self.order[start:end]:
+            word = self.words[int(i)]
+            if word not in result:
+                result.append(word)
+        return result
+
+    def completions(self, prefix, limit=5):
+        folded = fold(prefix.lower())
+        if len(folded) > self.length:
+            return 0, []
+        start, end = snapshot.prefix_range(self.keys, folded.encode("utf-32-be"))
+        return end - start, [self.words[int(i)] for i in self.order[start:min(end, start + limit)]]
+
+    def resolve(self, user_word, answer=None):
+        # regras fixas para chaves ambíguas: a resposta, se for uma das
+        # variantes; senão o que foi digitado, se existir; senão a primeira
+        variants = self.variants(user_word)
+        if not variants:
+            return None
+        if answer in variants:
+            return answer
+        if user_word.lower() in variants:
+            return user_word.lower()
+        return variants[0]
+
+# um índice por lista de palavras; o índice guarda a lista, então o id não
+# é reaproveitado por outra
+_indexes = caches.KeyedCache()
+
+def get_index(words):
+    return _indexes.get(id(words), lambda: FoldedIndex(words))
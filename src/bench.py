@@ -0,0 +1,187 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import functions
+import rankings
+import snapshot
+
+# benchmarks de load_words, check_word, classify_difficulty e save_score em
+# dicionários de tamanhos crescentes, com comparação contra um baseline
+WORDS = "data/words.csv"
+BASELINE = "benchmark_baseline.json"
+ALPHABET = "abcdefghijklmnopqrstuvwxyzáâãàçéêíóôõú"
+DEFAULT_SIZES = "real,10000,100000,1000000"
+
+def synthetic_words(n, seed=0):
+    rng = random.Random(seed)
+    weights = [1.0] * 26 + [0.05] * (len(ALPHABET) - 26)
+    return ["".join(rng.choices(ALPHABET, weights, k=5)) for _ in range(n)]
+
+def write_dictionary(folder, words):
+    path = os.path.join(folder, f"words_{len(words)}.csv")
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["palavra"])
+        for word in words:
+            writer.writerow([word])
+    return path
+
+def reset_cache():
+    functions._words.clear()
+    functions._last_path = None
+
+def bench_load_words(path, words, folder):
+    # caminho quente: o snapshot já existe e é aberto por memory map
+    def op():
+        reset_cache()
+        functions.load_words(path)
+    return op, 5 if len(words) < 1000000 else 3
+
+def bench_load_words_cold(path, words, folder):
+    # caminho frio: lê o csv e grava o snapshot a cada vez; usa uma cópia do
+    # dicionário para não apagar o snapshot de data/
+    cold = os.path.join(folder, f"cold_{len(words)}.csv")
+    if not os.path.exists(cold):
+        shutil.copyfile(path, cold)
+    snap = snapshot.snapshot_path(cold)
+    def op():
+        if os.path.exists(snap):
+            os.remove(snap)
+        reset_cache()
+        functions.load_words(cold)
+    return op, 5 if len(words) < 1000000 else 3
+
+def bench_check_word(path, words, folder):
+    rng = random.Random(1)
+    pairs = [(rng.choice(words), rng.choice(words)) for _ in range(20000)]
+    it = itertools.cycle(pairs)
+    def op():
+        correct, user = next(it)
+        functions.check_word(correct, user)
+    return op, 20000
+
+def bench_classify_difficulty(path, words, folder):
+    # words pode ser a WordList de load_words, que não se multiplica como lista
+    it = iter(list(words) * (20000 // len(words) + 2))
+    def op():
+        functions.classify_difficulty(next(it))
+    return op, 20000
+
+def bench_save_score(path, words, folder):
+    # save_score acrescenta uma linha ao rankings.csv com trava de arquivo; o
+    # arquivo começa com uma linha por palavra do dicionário (no máximo 10000)
+    fd, rankings_path = tempfile.mkstemp(suffix=".csv", dir=folder)
+    rng = random.Random(2)
+    with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        for _ in range(min(len(words), 10000)):
+            writer.writerow([f"AAA_{rng.randrange(1000)}"])
+    store = rankings.get_store(rankings_path)
+    def op():
+        store.add(f"BBB_{rng.randrange(1000)}")
+    return op, 200
+
+BENCHMARKS = {
+    "load_words": bench_load_words,
+    "load_words_cold": bench_load_words_cold,
+    "check_word": bench_check_word,
+    "classify_difficulty": bench_classify_difficulty,
+    "save_score": bench_save_score,
+}
+
+def measure(factory, path, words, folder):
+    op, repeat = factory(path, words, folder)
+    op()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        op()
+        timings.append(time.perf_counter_ns() - start)
+    timings.sort()
+
+    op, _ = factory(path, words, folder)
+    tracemalloc.start()
+    op()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(timings) / 1e9
+    return {
+        "ops_per_sec": repeat / total,
+        "p50_us": timings[len(timings) // 2] / 1000,
+        "p99_us": timings[min(int(len(timings) * 0.99), len(timings) - 1)] / 1000,
+        "peak_kb": peak / 1024,
+    }
+
+def compare(results, baseline, tolerance):
+    failures = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        slowdown = (result["p50_us"] / old["p50_us"] - 1) * 100
+        if slowdown > tolerance:
+            failures.append(f"{name}: p50 {old['p50_us']:.2f}us -> {result['p50_us']:.2f}us (+{slowdown:.0f}%)")
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks das funções de palavras do Letreco.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="tamanhos de dicionário; 'real' usa data/words.csv")
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help="benchmarks a rodar, separados por vírgula")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="grava os resultados como novo baseline")
+    parser.add_argument("--tolerance", type=float, default=20.0, help="lentidão máxima aceita em %% sobre o baseline")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.only.split(",") if name.strip()]
+    for name in names:
+        if name not in BENCHMARKS:
+            parser.error(f"benchmark desconhecido: {name}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for size in args.sizes.split(","):
+            size = size.strip()
+            if size == "real":
+                path = os.path.abspath(WORDS)
+                reset_cache()
+                words = list(functions.load_words(path)[0])
+            else:
+                words = synthetic_words(int(size))
+                path = write_dictionary(folder, words)
+            for name in names:
+                key = f"{name}[{len(words)}]"
+                results[key] = measure(BENCHMARKS[name], path, words, folder)
+                r = results[key]
+                print(f"{key:<32} {r['ops_per_sec']:>14,.1f} ops/s  p50 {r['p50_us']:>12.2f}us  "
+                      f"p99 {r['p99_us']:>12.2f}us  pico {r['peak_kb']:>10.0f}KB")
+    reset_cache()
+
+    if args.save:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline salvo em {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        failures = compare(results, baseline, args.tolerance)
+        if failures:
+            print(f"\nMais de {args.tolerance:.0f}% mais lento que o baseline:")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        print(f"\nDentro de {args.tolerance:.0f}% do baseline {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
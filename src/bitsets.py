@@ -0,0 +1,87 @@
+import numpy as np
+import caches
+import functions
+
+# conjuntos de palavras como bitsets (um bit por palavra, em uint64): para
+# cada posição e letra as palavras com aquela letra ali, e para cada letra as
+# palavras com pelo menos k ocorrências dela; o resultado de check_word vira
+# só AND e AND NOT entre bitsets
+
+if hasattr(np, "bitwise_count"):
+    def popcount(bits):
+        return int(np.bitwise_count(bits).sum())
+else:
+    _BYTE_COUNTS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount(bits):
+        return int(_BYTE_COUNTS[bits.view(np.uint8)].sum(dtype=np.int64))
+
+def pack(flags):
+    bits = np.packbits(flags, bitorder="little")
+    padded = np.zeros(-(-len(bits) // 8) * 8, dtype=np.uint8)
+    padded[:len(bits)] = bits
+    return padded.view(np.uint64)
+
+class BitsetIndex:
+    def __init__(self, words):
+        self.words = words
+        matrix = functions.encode_words(words)
+        self.length = matrix.shape[1]
+        self.empty = pack(np.zeros(len(words), dtype=bool))
+        self.full = pack(np.ones(len(words), dtype=bool))
+        self.positions = []
+        for pos in range(self.length):
+            column = matrix[:, pos]
+            self.positions.append({chr(c): pack(column == c) for c in np.unique(column)})
+        # at_least[letra][k - 1]: palavras com k ou mais ocorrências da letra
+        self.at_least = {}
+        for c in np.unique(matrix):
+            counts = (matrix == c).sum(axis=1)
+            self.at_least[chr(c)] = [pack(counts >= k) for k in range(1, self.length + 1)]
+
+    def with_letter(self, pos, letter):
+        return self.positions[pos].get(letter, self.empty)
+
+    def with_count(self, letter, k):
+        # palavras com pelo menos k ocorrências da letra
+        if k <= 0:
+            return self.full
+        if k > self.length or letter not in self.at_least:
+            return self.empty
+        return self.at_least[letter][k - 1]
+
+    def constrain(self, mask, guess, result):
+        # palavras de mask que dariam o mesmo resultado de check_word para guess
+        mask = mask.copy()
+        found = {}
+        gray = set()
+        for pos, (letter, status) in enumerate(zip(guess, result)):
+            if status == "correta":
+                mask &= self.with_letter(pos, letter)
+            else:
+                mask &= ~self.with_letter(pos, letter)
+            if status == "inexistente":
+                gray.add(letter)
+            else:
+                found[letter] = found.get(letter, 0) + 1
+        for letter in set(guess):
+            k = found.get(letter, 0)
+            mask &= self.with_count(letter, k)
+            # uma ocorrência cinza limita a contagem ao que foi encontrado
+            if letter in gray:
+                mask &= ~self.with_count(letter, k + 1)
+        return mask
+
+    def count(self, mask):
+        return popcount(mask)
+
+    def members(self, mask):
+        flags = np.unpackbits(mask.view(np.uint8), bitorder="little")[:len(self.words)]
+        return np.flatnonzero(flags)
+
+# um índice por lista de palavras; o índice guarda a lista, então o id não
+# é reaproveitado por outra
+_indexes = caches.KeyedCache()
+
+def get_index(words):
+    return _indexes.get(id(words), lambda: BitsetIndex(words))
@@ -0,0 +1,29 @@
+import threading
+
+# caches por dicionário (palavras, tabela de padrões, índices) compartilhados
+# entre a janela, o DataLoader e as HintWorkers: um valor por chave, então
+# trocar o tamanho da palavra não descarta os dos outros tamanhos, e cada
+# chave é preenchida uma vez só, sob a trava dela
+class KeyedCache:
+    def __init__(self):
+        self.values = {}
+        self.lock = threading.Lock()
+        self.key_locks = {}
+
+    def get(self, key, build):
+        value = self.values.get(key)
+        if value is not None:
+            return value
+        with self.lock:
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+        # só quem pede a mesma chave espera; outros dicionários carregam em paralelo
+        with key_lock:
+            value = self.values.get(key)
+            if value is None:
+                value = build()
+                self.values[key] = value
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.values.clear()
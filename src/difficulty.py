@@ -0,0 +1,96 @@
+import os
+import sys
+from collections import Counter
+import numpy as np
+import caches
+import functions
+import patterns
+
+# dificuldade medida sobre o dicionário inteiro: combina a raridade das letras
+# em cada posição, quantas palavras sobram em média depois de uma tentativa e
+# quantas palavras diferem em só uma letra (onde as tentativas param de ajudar)
+LEVELS = ("FÁCIL", "MÉDIA", "DIFÍCIL", "IMPOSSÍVEL")
+# fração acumulada de palavras até o fim de cada nível
+CUTOFFS = (0.4, 0.7, 0.9)
+
+# índices carregados, pelo caminho do arquivo do índice
+_indexes = caches.KeyedCache()
+
+def index_path(filepath):
+    return patterns.cache_path(filepath, "difficulty")
+
+def average_remaining(table):
+    # para cada resposta, média sobre todas as tentativas de quantas palavras
+    # dão o mesmo padrão que ela
+    n = table.shape[0]
+    total = np.zeros(n)
+    for guess in range(n):
+        row = np.asarray(table[guess])
+        total += np.bincount(row)[row]
+    return total / n
+
+def letter_rarity(words):
+    matrix = functions.encode_words(words)
+    rarity = np.zeros(len(words))
+    for pos in range(matrix.shape[1]):
+        _, inverse, counts = np.unique(matrix[:, pos], return_inverse=True, return_counts=True)
+        rarity -= np.log(counts[inverse] / len(words))
+    return rarity / matrix.shape[1]
+
+def neighbor_count(words):
+    matrix = functions.encode_words(words)
+    count = np.zeros(len(words))
+    for pos in range(matrix.shape[1]):
+        others = np.delete(matrix, pos, axis=1)
+        _, inverse, counts = np.unique(others, axis=0, return_inverse=True, return_counts=True)
+        count += counts[inverse.ravel()] - 1
+    return count
+
+def zscore(values):
+    std = values.std()
+    return (values - values.mean()) / std if std > 0 else values * 0
+
+def build_index(words, table):
+    score = (zscore(average_remaining(table)) + zscore(neighbor_count(words))
+             + zscore(letter_rarity(words)))
+    ranks = np.empty(len(words))
+    ranks[np.argsort(score, kind="stable")] = np.arange(len(words)) / max(len(words), 1)
+    return np.searchsorted(np.array(CUTOFFS), ranks, side="right").astype(np.uint8)
+
+class DifficultyIndex:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.members = [np.flatnonzero(buckets == level) for level in range(len(LEVELS))]
+
+    def level(self, word_index):
+        return LEVELS[self.buckets[word_index]]
+
+    def choose(self, level, rng):
+        # sorteio O(1) dentro do nível pedido
+        members = self.members[LEVELS.index(level)]
+        return int(members[rng.randrange(len(members))])
+
+def load_index(filepath):
+    path = index_path(filepath)
+    return _indexes.get(path, lambda: open_index(filepath, path))
+
+def open_index(filepath, path):
+    words, _ = functions.load_words(filepath)
+    if os.path.exists(path) and os.path.getsize(path) == len(words):
+        buckets = np.fromfile(path, dtype=np.uint8)
+    else:
+        buckets = build_index(words, patterns.load_table(filepath))
+        tmp = f"{path}.{os.getpid()}.tmp"
+        buckets.tofile(tmp)
+        os.replace(tmp, path)
+        patterns.remove_stale(path)
+
+    return DifficultyIndex(buckets)
+
+if __name__ == "__main__":
+    filepath = sys.argv[1] if len(sys.argv) > 1 else 'data/words.csv'
+    index = load_index(filepath)
+    words, _ = functions.load_words(filepath)
+    counts = Counter(index.level(i) for i in range(len(words)))
+    for level in LEVELS:
+        print(f"{level}: {counts[level]}")
@@ -0,0 +1,164 @@
+import argparse
+import os
+import struct
+import sys
+import time
+import numpy as np
+import functions
+import patterns
+import rankings
+
+# log binário só de acréscimo com um registro de 32 bytes por evento de jogo
+# (tentativa, vitória, derrota, tempo esgotado, desistência); as palavras são
+# guardadas pelo índice no dicionário, identificado pelo hash no cabeçalho
+MAGIC = b"LTEV"
+VERSION = 1
+HEADER = struct.Struct("<4sII16s")  # magic, versão, tamanho do registro, hash do dicionário
+RECORD = struct.Struct("<dQIIIHBB")
+EVENT_DTYPE = np.dtype([
+    ("time", "<f8"),        # time.time() do evento
+    ("game", "<u8"),        # id da partida
+    ("word", "<u4"),        # índice da palavra secreta
+    ("guess", "<u4"),       # índice da tentativa, NO_WORD sem tentativa
+    ("elapsed_ms", "<u4"),  # tempo de jogo desde a primeira tentativa
+    ("pattern", "<u2"),     # código de padrão da tentativa
+    ("attempt", "u1"),
+    ("kind", "u1"),
+])
+NO_WORD = 0xFFFFFFFF
+GUESS, WIN, LOSS, TIMEOUT, ABANDON = range(5)
+KIND_NAMES = ("tentativa", "vitória", "derrota", "tempo esgotado", "desistência")
+# eventos que encerram uma partida
+OUTCOMES = (WIN, LOSS, TIMEOUT, ABANDON)
+
+def events_path(filepath):
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    return os.path.join(os.path.dirname(filepath), f"events_{stem}.bin")
+
+def new_game_id():
+    return int.from_bytes(os.urandom(8), "little")
+
+def read_header(path):
+    with open(path, 'rb') as f:
+        data = f.read(HEADER.size)
+    if len(data) < HEADER.size:
+        return None
+    magic, version, record_size, digest = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        return None
+    return digest.decode("ascii")
+
+class EventLog:
+    def __init__(self, path, words_hash):
+        self.path = path
+        self.words_hash = words_hash
+        with rankings.file_lock(path):
+            # log de outro dicionário (ou versão): guarda com o hash antigo e começa outro
+            if os.path.exists(path) and read_header(path) != words_hash:
+                old = read_header(path) or "invalido"
+                os.replace(path, f"{os.path.splitext(path)[0]}_{old}_{int(time.time())}.bin")
+            flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+            self.fd = os.open(path, flags, 0o644)
+            if os.fstat(self.fd).st_size == 0:
+                os.write(self.fd, HEADER.pack(MAGIC, VERSION, RECORD.size, words_hash.encode("ascii")))
+
+    def write(self, game, word, kind, guess=NO_WORD, pattern=0, attempt=0, elapsed_ms=0):
+        # um único write com O_APPEND: registros de processos diferentes não se misturam
+        os.write(self.fd, RECORD.pack(time.time(), game, word, guess, elapsed_ms, pattern, attempt, kind))
+
+    def close(self):
+        os.close(self.fd)
+
+_logs = {}
+
+def get_log(filepath):
+    # None se o log não puder ser aberto; o jogo continua sem registrar
+    if filepath not in _logs:
+        try:
+            _logs[filepath] = EventLog(events_path(filepath), patterns.words_hash(filepath))
+        except OSError:
+            _logs[filepath] = None
+    return _logs[filepath]
+
+def open_events(path):
+    # memory map dos registros completos (um registro cortado no fim é ignorado)
+    digest = read_header(path)
+    if digest is None:
+        raise ValueError(f"{path} is not an event log.")
+    n = (os.path.getsize(path) - HEADER.size) // RECORD.size
+    if n == 0:
+        return digest, np.zeros(0, dtype=EVENT_DTYPE)
+    return digest, np.memmap(path, dtype=EVENT_DTYPE, mode='r', offset=HEADER.size, shape=(n,))
+
+def summarize(log, n_words):
+    kind = np.asarray(log["kind"])
+    ends = np.flatnonzero(np.isin(kind, OUTCOMES))
+    end_kind = kind[ends]
+    end_word = np.asarray(log["word"])[ends]
+    won = end_kind == WIN
+    games = np.bincount(end_word, minlength=n_words)
+    wins = np.bincount(end_word, weights=won, minlength=n_words)
+    wins_elapsed = np.asarray(log["elapsed_ms"])[ends][won].astype(np.float64)
+    time_to_solve = np.bincount(end_word[won], weights=wins_elapsed, minlength=n_words)
+    return {
+        "events": len(log),
+        "games": len(ends),
+        "outcomes": np.bincount(end_kind, minlength=len(KIND_NAMES)),
+        "guesses": np.bincount(np.asarray(log["attempt"])[ends][won], minlength=7),
+        "abandoned_at": np.bincount(np.asarray(log["attempt"])[ends][end_kind == ABANDON], minlength=7),
+        "average_ms": wins_elapsed.mean() if len(wins_elapsed) else 0.0,
+        "word_games": games,
+        "word_wins": wins,
+        "word_ms": np.divide(time_to_solve, wins, out=np.zeros(n_words), where=wins > 0),
+    }
+
+def print_report(summary, words, top, min_games):
+    games = summary["games"]
+    print(f"{summary['events']:,} eventos, {games:,} partidas terminadas")
+    if games == 0:
+        return
+    for kind in OUTCOMES:
+        count = summary["outcomes"][kind]
+        print(f"  {KIND_NAMES[kind]}: {count:,} ({count / games:.1%})")
+    wins = summary["outcomes"][WIN]
+    print(f"tempo médio até acertar: {summary['average_ms'] / 1000:.1f}s")
+    print("tentativas até acertar:")
+    for attempt in range(1, len(summary["guesses"])):
+        count = summary["guesses"][attempt]
+        print(f"  {attempt}: {count:>10,} {'#' * round(40 * count / max(wins, 1))}")
+    if summary["outcomes"][ABANDON]:
+        print("desistências por tentativas feitas:", ", ".join(
+            f"{attempt}: {count:,}" for attempt, count in enumerate(summary["abandoned_at"]) if count))
+
+    played = np.flatnonzero(summary["word_games"] >= min_games)
+    if len(played) == 0:
+        return
+    rate = summary["word_wins"][played] / summary["word_games"][played]
+    order = np.lexsort((-summary["word_games"][played], rate))
+    print(f"palavras mais difíceis (mínimo de {min_games} partidas):")
+    for i in played[order[:top]]:
+        print(f"  {words[i]}  acertos {summary['word_wins'][i] / summary['word_games'][i]:.0%} "
+              f"em {summary['word_games'][i]:,} partidas, tempo médio {summary['word_ms'][i] / 1000:.1f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Estatísticas do log de eventos das partidas.")
+    parser.add_argument("--words", default="data/words.csv")
+    parser.add_argument("--log", help="por padrão o log ao lado do dicionário")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--min-games", type=int, default=10)
+    args = parser.parse_args()
+
+    path = args.log or events_path(args.words)
+    start = time.perf_counter()
+    digest, log = open_events(path)
+    if digest != patterns.words_hash(args.words):
+        print(f"{path} foi gravado com outro dicionário", file=sys.stderr)
+        return 1
+    words, _ = functions.load_words(args.words)
+    summary = summarize(log, len(words))
+    print_report(summary, words, args.top, args.min_games)
+    print(f"({time.perf_counter() - start:.2f}s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,47 +1,96 @@
 import csv
+import os
+import numpy as np
+import caches
+import snapshot
 
-_word_list = None
-_word_set = None
+# (WordList, WordSet) por caminho do csv; check_word_batch sem alvos usa o
+# último dicionário carregado
+_words = caches.KeyedCache()
+_last_path = None
 
-def load_words(filepath):
-    global _word_list, _word_set
-    if _word_list is not None and _word_set is not None:
-        return _word_list, _word_set
+# códigos de feedback por letra; o padrão da palavra é sum(código * 3**posição)
+INEXISTENTE, EXISTE, CORRETA = 0, 1, 2
+STATUS_NAMES = ("inexistente", "existe", "correta")
+
+# modos de jogo por tamanho de palavra; 5 letras usa o dicionário original
+WORD_LENGTH = 5
+WORD_LENGTHS = (4, 5, 6, 7)
+
+def dictionary_path(length, folder="data"):
+    if length == WORD_LENGTH:
+        return os.path.join(folder, "words.csv")
+    return os.path.join(folder, f"words_{length}.csv")
+
+def available_lengths(folder="data"):
+    return [length for length in WORD_LENGTHS if os.path.exists(dictionary_path(length, folder))]
+
+def n_patterns(length=WORD_LENGTH):
+    return 3 ** length
+
+def all_correct(length=WORD_LENGTH):
+    return n_patterns(length) - 1
 
+def pattern_dtype(length=WORD_LENGTH):
+    # até 5 letras os 243 códigos cabem em um byte
+    return np.uint8 if n_patterns(length) <= 256 else np.uint16
+
+def read_words(filepath, length=None):
+    # todas as palavras têm o tamanho da primeira (ou o pedido); as outras são ignoradas
     words = []
     with open(filepath, encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
             word = row['palavra'].strip().lower()
-            if len(word) == 5:
+            if length is None and word:
+                length = len(word)
+            if word and len(word) == length:
                 words.append(word)
+    return words
 
-    if not words:
-        raise ValueError("The list must not be empty.")
+def load_words(filepath):
+    global _last_path
+    words = _words.get(filepath, lambda: read_dictionary(filepath))
+    _last_path = filepath
+    return words
 
-    _word_list = words
-    _word_set = set(words)
-    return _word_list, _word_set
+def read_dictionary(filepath):
+    # usa o snapshot binário ao lado do csv, refazendo-o se o csv mudou
+    path = snapshot.snapshot_path(filepath)
+    words = snapshot.open_snapshot(path, filepath)
+    if words is None:
+        parsed = read_words(filepath)
+        if not parsed:
+            raise ValueError("The list must not be empty.")
+        try:
+            words = snapshot.write_snapshot(parsed, path, filepath)
+        except OSError:
+            words = snapshot.WordList.from_words(parsed)
+
+    if len(words) == 0:
+        raise ValueError("The list must not be empty.")
+    return words, snapshot.WordSet(words)
 
 def check_word(correct_word, user_word):
-    if len(correct_word) != 5 or len(user_word) != 5:
-        raise ValueError("Both words must have 5 letters!")
+    length = len(correct_word)
+    if length not in WORD_LENGTHS or len(user_word) != length:
+        raise ValueError("Both words must have the same length (4 to 7 letters)!")
 
-    result = ["inexistente"] * 5
-    used = [False] * 5  # Marca letras já usadas da palavra correta
+    result = ["inexistente"] * length
+    used = [False] * length  # Marca letras já usadas da palavra correta
     user_word = user_word.lower()
 
     # verificar letras corretas (verde)
-    for i in range(5):
+    for i in range(length):
         if user_word[i] == correct_word[i]:
             result[i] = "correta"
             used[i] = True
 
     # verificar letras existentes em outra posição (amarelo)
-    for i in range(5):
+    for i in range(length):
         if result[i] == "correta":
             continue
-        for j in range(5):
+        for j in range(length):
             if not used[j] and user_word[i] == correct_word[j]:
                 result[i] = "existe"
                 used[j] = True
@@ -49,6 +98,83 @@ def check_word(correct_word, user_word):
 
     return result
 
+def encode_words(words):
+    # matriz (n, tamanho) de code points, uma linha por palavra
+    if isinstance(words, snapshot.WordList):
+        return words.matrix
+    if len(words) == 0:
+        return np.empty((0, WORD_LENGTH), dtype=np.uint32)
+    length = len(words[0])
+    if any(len(word) != length for word in words):
+        raise ValueError("All words must have the same length!")
+    data = "".join(words).encode("utf-32-le")
+    return np.frombuffer(data, dtype=np.uint32).reshape(-1, length)
+
+def word_matrix():
+    if _last_path is None:
+        raise ValueError("The word list was not loaded.")
+    return encode_words(load_words(_last_path)[0])
+
+def pattern_matrix(guesses, targets):
+    # códigos de padrão para todo par (tentativa, alvo): array (g, t) do
+    # tipo de pattern_dtype (uint8 até 5 letras)
+    if not isinstance(guesses, np.ndarray):
+        guesses = encode_words([word.lower() for word in guesses])
+    if not isinstance(targets, np.ndarray):
+        targets = encode_words(targets)
+    length = guesses.shape[1]
+    if targets.shape[1] != length:
+        raise ValueError("Both words must have the same length!")
+    dtype = pattern_dtype(length)
+
+    # colunas contíguas: cada comparação é uma operação (g, 1) x (t,)
+    G = [guesses[:, i:i + 1] for i in range(length)]
+    T = [np.ascontiguousarray(targets[:, j]) for j in range(length)]
+
+    # verificar letras corretas (verde)
+    green = [G[i] == T[i] for i in range(length)]
+    free = [~g for g in green]
+
+    # verificar letras existentes em outra posição (amarelo): a letra i é
+    # amarela se sobram ocorrências livres dela no alvo depois das posições
+    # anteriores da tentativa com a mesma letra, como em check_word
+    codes = np.zeros((len(guesses), len(targets)), dtype=dtype)
+    for i in range(length):
+        available = np.zeros(codes.shape, dtype=np.int8)
+        for j in range(length):
+            available += (T[j] == G[i]) & free[j]
+        for k in range(i):
+            available -= (G[k] == G[i]) & free[k]
+        status = green[i].view(np.uint8) * CORRETA + (free[i] & (available > 0))
+        codes += status.astype(dtype) * dtype(3 ** i)
+    return codes
+
+def check_word_batch(user_word, targets=None):
+    # mesmo resultado de check_word(target, user_word) para cada target,
+    # devolvido como array de códigos de padrão (pattern_dtype do tamanho);
+    # targets pode ser uma matriz já codificada, uma WordList ou uma lista
+    if targets is None:
+        targets = word_matrix()
+    elif not isinstance(targets, np.ndarray):
+        targets = encode_words(targets)
+    if len(user_word) != targets.shape[1]:
+        raise ValueError("Both words must have the same length!")
+    return pattern_matrix([user_word], targets)[0]
+
+def encode_pattern(result):
+    code = 0
+    for i, status in enumerate(result):
+        code += STATUS_NAMES.index(status) * 3 ** i
+    return code
+
+def decode_pattern(code, length=WORD_LENGTH):
+    code = int(code)
+    result = []
+    for _ in range(length):
+        result.append(STATUS_NAMES[code % 3])
+        code //= 3
+    return result
+
 def classify_difficulty(word):
     word = word.upper()
 
@@ -70,7 +196,7 @@ def classify_difficulty(word):
         return "FÁCIL"
     elif score == 1:
         return "MÉDIA"
-    elif score >= 2:
+    elif score < 4:
         return "DIFÍCIL"
     else:
         return "IMPOSSÍVEL"
\ No newline at end of file
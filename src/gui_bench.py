@@ -0,0 +1,239 @@
+import argparse
+import gc
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
+from PyQt5.QtCore import Qt, QObject, QEvent, QTimer, qInstallMessageHandler
+from PyQt5.QtGui import QKeyEvent
+from PyQt5.QtTest import QTest
+import main
+import terminal
+
+# joga centenas de rodadas roteirizadas na janela real, sem tela (plataforma
+# offscreen do Qt), digitando com eventos de teclado sintéticos; mede a
+# latência de ponta a ponta de cada ação (até os eventos e pinturas
+# pendentes serem processados) e conta widgets e objetos para achar vazamentos
+OPERATIONS = ("start_game", "tecla", "check_input", "restart_game", "RankingsWindow")
+DATA_FILES = ("words", "patterns_", "difficulty_")
+MENU_TIMEOUT = 30
+
+class Timings:
+    def __init__(self):
+        self.durations = {name: [] for name in OPERATIONS}
+
+    def clear(self):
+        for values in self.durations.values():
+            values.clear()
+
+    def add(self, name, start):
+        self.durations[name].append((time.perf_counter() - start) * 1000)
+
+    def summary(self):
+        lines = [f"{'operação':<16} {'vezes':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'máx ms':>9}"]
+        for name, values in self.durations.items():
+            if not values:
+                continue
+            values = sorted(values)
+            p50, p90, p99 = (values[min(int(len(values) * q), len(values) - 1)] for q in (0.5, 0.9, 0.99))
+            lines.append(f"{name:<16} {len(values):>7} {p50:>9.2f} {p90:>9.2f} {p99:>9.2f} {values[-1]:>9.2f}")
+        return "\n".join(lines)
+
+def settle(app):
+    # termina o que a ação deixou na fila: pinturas, layouts e deleteLater
+    app.processEvents()
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+
+def press(widget, text):
+    # QTest.keyClicks só aceita ASCII; letras acentuadas vão como texto do evento
+    for kind in (QEvent.KeyPress, QEvent.KeyRelease):
+        QApplication.sendEvent(widget, QKeyEvent(kind, 0, Qt.NoModifier, text))
+
+def quiet(kind, context, message):
+    # o plugin offscreen avisa a cada adjustSize; o resto segue para stderr
+    if "propagateSizeHints" not in message:
+        print(message, file=sys.stderr)
+
+def counts():
+    gc.collect()
+    objects = gc.get_objects()
+    return {
+        "widgets": len(QApplication.allWidgets()),
+        "QObjects": sum(1 for obj in objects if isinstance(obj, QObject)),
+        "objetos Python": len(objects),
+    }
+
+def work_folder(source):
+    # cópia de trabalho com ligações para o dicionário e os caches: o
+    # benchmark grava pontuações e eventos sem tocar nos arquivos do jogador
+    folder = tempfile.mkdtemp(prefix="letreco_gui_bench_")
+    os.makedirs(os.path.join(folder, "data"))
+    for name in os.listdir(os.path.join(source, "data")):
+        if name.startswith(DATA_FILES):
+            os.symlink(os.path.join(source, "data", name), os.path.join(folder, "data", name))
+    os.symlink(os.path.join(source, "assets"), os.path.join(folder, "assets"))
+    return folder
+
+class Player:
+    def __init__(self, app, timings, rng, boards):
+        self.app = app
+        self.timings = timings
+        self.rng = rng
+        self.boards = boards
+        self.menu = None
+        self.game = None
+        self.restarts = 0
+        wrapped = main.LetrecoGame.restart_game
+
+        def restart_game(game):
+            start = time.perf_counter()
+            wrapped(game)
+            self.app.processEvents()
+            self.timings.add("restart_game", start)
+            self.restarts += 1
+        main.LetrecoGame.restart_game = restart_game
+
+    def open_menu(self, menu):
+        self.menu = menu
+        self.menu.boards_box.setCurrentIndex(self.menu.boards_box.findData(self.boards))
+        # um menu preso em "Carregando palavras..." falha em vez de travar
+        deadline = time.perf_counter() + MENU_TIMEOUT
+        while not self.menu.btn_play.isEnabled():
+            if time.perf_counter() > deadline:
+                raise RuntimeError(f"play button still disabled after {MENU_TIMEOUT}s")
+            self.app.processEvents()
+            time.sleep(0.01)
+
+    def start_game(self):
+        start = time.perf_counter()
+        QTest.mouseClick(self.menu.btn_play, Qt.LeftButton)
+        settle(self.app)
+        self.timings.add("start_game", start)
+        self.game = self.menu.jogo
+
+    def return_to_menu(self):
+        self.game.voltar_button.click()
+        settle(self.app)
+        self.open_menu(self.game.menu)
+
+    def open_rankings(self):
+        # o diálogo é modal: fecha assim que o laço dele pinta a janela
+        start = time.perf_counter()
+
+        def close():
+            dialog = QApplication.activeModalWidget()
+            self.app.processEvents()
+            self.timings.add("RankingsWindow", start)
+            dialog.reject()
+            dialog.deleteLater()
+        QTimer.singleShot(0, close)
+        self.menu.show_rankings()
+        settle(self.app)
+
+    def type_word(self, word):
+        for field, letter in zip(self.game.input_fields, word):
+            start = time.perf_counter()
+            press(field, letter)
+            settle(self.app)
+            self.timings.add("tecla", start)
+        start = time.perf_counter()
+        QTest.keyClick(self.game.input_fields[-1], Qt.Key_Return)
+        settle(self.app)
+        self.timings.add("check_input", start)
+
+    def play_round(self):
+        # acerta em uma tentativa sorteada ou perde com tentativas erradas
+        game = self.game
+        answers = game.session.chosen_words if self.boards > 1 else [game.session.chosen_word]
+        restarts = self.restarts
+        win_at = self.rng.randint(1, game.session.max_attempts + 2)
+        while self.restarts == restarts:
+            if game.session.attempts + 1 >= win_at:
+                word = next(w for w, solved in zip(answers, getattr(game.session, "solved", [False]))
+                            if not solved)
+            else:
+                word = self.rng.choice(game.word_list)
+            self.type_word(word)
+
+def cycle(player, rankings):
+    player.return_to_menu()
+    if rankings:
+        player.open_rankings()
+    player.start_game()
+
+def run(rounds, boards, menu_every, rankings_every, seed):
+    qInstallMessageHandler(quiet)
+    app = QApplication(sys.argv[:1])
+    # diálogos modais travariam o roteiro: vitória salva "BOT", derrota só fecha
+    QMessageBox.information = staticmethod(lambda *a, **k: None)
+    QMessageBox.warning = staticmethod(lambda *a, **k: None)
+
+    def accept_score(dialog):
+        dialog.input.setText("BOT")
+        return QDialog.Accepted
+    main.ScoreDialog.exec_ = accept_score
+
+    timings = Timings()
+    player = Player(app, timings, random.Random(seed), boards)
+    player.open_menu(main.InitialScreen())
+    player.menu.show()
+    player.start_game()
+    # uma volta completa aquece caches, fontes e os tipos que o PyQt carrega
+    # no primeiro uso; as contagens começam depois dela
+    player.play_round()
+    cycle(player, True)
+    timings.clear()
+    settle(app)
+    # a primeira varredura com isinstance cria atributos preguiçosos do sip
+    counts()
+    before = counts()
+    for i in range(1, rounds + 1):
+        if i % rankings_every == 0 or i % menu_every == 0:
+            cycle(player, i % rankings_every == 0)
+        player.play_round()
+    settle(app)
+    after = counts()
+    player.game.close()
+    return timings, before, after
+
+def main_bench():
+    parser = argparse.ArgumentParser(description="Latência da interface Qt sem tela, com rodadas roteirizadas.")
+    parser.add_argument("--rounds", type=int, default=300)
+    parser.add_argument("--boards", type=int, default=1, choices=(1,) + main.session.BOARD_COUNTS)
+    parser.add_argument("--menu-every", type=int, default=20, help="volta ao menu e recomeça a cada N rodadas")
+    parser.add_argument("--rankings-every", type=int, default=50, help="abre as pontuações a cada N rodadas")
+    parser.add_argument("--max-widgets", type=int, default=0,
+                        help="crescimento de widgets tolerado antes de acusar vazamento")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    source = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    folder = work_folder(source)
+    os.environ.pop("LETRECO_DB", None)
+    try:
+        os.chdir(folder)
+        timings, before, after = run(args.rounds, args.boards, args.menu_every, args.rankings_every, args.seed)
+    finally:
+        os.chdir(source)
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print(timings.summary())
+    print(f"{'contagem':<16} {'início':>10} {'fim':>10} {'diferença':>10}")
+    for name in before:
+        print(f"{name:<16} {before[name]:>10,} {after[name]:>10,} {after[name] - before[name]:>+10,}")
+    rss = terminal.max_rss_mb()
+    if rss is not None:
+        print(f"memória (RSS máximo): {rss:.1f} MB")
+    if after["widgets"] - before["widgets"] > args.max_widgets:
+        print("vazamento: o número de widgets cresceu durante as rodadas")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main_bench())
@@ -0,0 +1,97 @@
+import os
+import sqlite3
+import time
+
+# histórico opcional de todas as partidas em SQLite; ativado pela variável de
+# ambiente LETRECO_DB com o caminho do banco (ex: data/history.db)
+ENV_VAR = "LETRECO_DB"
+PAGE_SIZE = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    initials TEXT,
+    score INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    elapsed REAL NOT NULL,
+    word TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    played_at REAL NOT NULL,
+    day TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_all_time ON games (score DESC, id)
+    WHERE initials IS NOT NULL;
+CREATE INDEX IF NOT EXISTS games_by_day ON games (day, score DESC, id)
+    WHERE initials IS NOT NULL;
+CREATE INDEX IF NOT EXISTS games_by_difficulty ON games (difficulty, score DESC, id)
+    WHERE initials IS NOT NULL;
+"""
+
+class HistoryStore:
+    def __init__(self, path):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def record(self, game, initials=None, played_at=None):
+        if played_at is None:
+            played_at = time.time()
+        day = time.strftime("%Y-%m-%d", time.localtime(played_at))
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO games (initials, score, won, attempts, elapsed, word, difficulty, played_at, day)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (initials, game.score or 0, int(game.won), game.attempts, game.elapsed(),
+                 game.chosen_word, game.difficulty(), played_at, day),
+            )
+        return cursor.lastrowid
+
+    def page(self, after=None, day=None, difficulty=None, size=PAGE_SIZE):
+        # paginação por chave (score, id): cada página é uma busca no índice,
+        # sem OFFSET, então a última página custa o mesmo que a primeira
+        where = ["initials IS NOT NULL"]
+        params = []
+        if day is not None:
+            where.append("day = ?")
+            params.append(day)
+        if difficulty is not None:
+            where.append("difficulty = ?")
+            params.append(difficulty)
+        if after is not None:
+            score, row_id = after
+            # score <= ? fica de fora do OR para o SQLite buscar direto no índice
+            where.append("score <= ? AND (score < ? OR id > ?)")
+            params += [score, score, row_id]
+        rows = self.conn.execute(
+            f"SELECT id, initials, score FROM games WHERE {' AND '.join(where)}"
+            " ORDER BY score DESC, id LIMIT ?",
+            params + [size],
+        ).fetchall()
+        return rows
+
+    def has_scores(self):
+        return self.conn.execute("SELECT 1 FROM games WHERE initials IS NOT NULL LIMIT 1").fetchone() is not None
+
+    def clear_rankings(self):
+        # tira as pontuações dos rankings, mas mantém as partidas para estatísticas
+        with self.conn:
+            self.conn.execute("UPDATE games SET initials = NULL WHERE initials IS NOT NULL")
+
+    def close(self):
+        self.conn.close()
+
+_store = None
+
+def get_store():
+    global _store
+    path = os.environ.get(ENV_VAR)
+    if not path:
+        return None
+    if _store is None or _store.path != path:
+        _store = HistoryStore(path)
+    return _store
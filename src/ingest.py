@@ -0,0 +1,158 @@
+import argparse
+import csv
+import gzip
+import heapq
+import os
+import re
+import sys
+import tempfile
+import time
+import unicodedata
+import accents
+import functions
+
+# monta os dicionários por tamanho a partir de listas e corpora grandes (.txt,
+# .csv, também .gz), lendo linha a linha: as palavras únicas ficam em memória
+# só até --chunk-size, depois vão ordenadas para arquivos temporários que são
+# intercalados no final, então a memória não cresce com o tamanho da entrada
+ALPHABET = "abcdefghijklmnopqrstuvwxyzáâãàçéêíóôõú"
+CHUNK_SIZE = 1000000
+TOKEN = re.compile(r"[^\W\d_]+")
+
+def open_text(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace', newline='')
+    return open(path, encoding='utf-8', errors='replace', newline='')
+
+def normalize(text):
+    return unicodedata.normalize("NFC", text.strip().lower())
+
+def read_tokens(path, column="palavra"):
+    # csv: uma palavra por linha na coluna pedida (ou na primeira); outros
+    # formatos: toda sequência de letras de cada linha
+    is_csv = path[:-3].endswith(".csv") if path.endswith(".gz") else path.endswith(".csv")
+    with open_text(path) as f:
+        if is_csv:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            pos = header.index(column) if column in header else 0
+            if column not in header and header:
+                yield normalize(header[pos])
+            for row in reader:
+                if len(row) > pos:
+                    yield normalize(row[pos])
+        else:
+            for line in f:
+                yield from TOKEN.findall(normalize(line))
+
+def sort_key(word):
+    # mesma ordem do dicionário original: sem acentos primeiro, depois code points
+    return accents.fold(word), word
+
+class RunWriter:
+    def __init__(self, folder, lengths, chunk_size):
+        self.folder = folder
+        self.chunk_size = chunk_size
+        self.pending = {length: set() for length in lengths}
+        self.size = 0
+        self.runs = {length: [] for length in lengths}
+
+    def add(self, word):
+        words = self.pending[len(word)]
+        if word not in words:
+            words.add(word)
+            self.size += 1
+            if self.size >= self.chunk_size:
+                self.spill()
+
+    def spill(self):
+        for length, words in self.pending.items():
+            if not words:
+                continue
+            path = os.path.join(self.folder, f"run_{length}_{len(self.runs[length])}.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                for word in sorted(words, key=sort_key):
+                    f.write(word + "\n")
+            self.runs[length].append(path)
+            words.clear()
+        self.size = 0
+
+def read_run(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+def merge_runs(paths, output):
+    # intercala os arquivos já ordenados, descartando repetidas
+    count = 0
+    previous = None
+    tmp = f"{output}.{os.getpid()}.tmp"
+    with open(tmp, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["palavra"])
+        for word in heapq.merge(*(read_run(path) for path in paths), key=sort_key):
+            if word != previous:
+                writer.writerow([word])
+                count += 1
+                previous = word
+    os.replace(tmp, output)
+    return count
+
+def ingest(sources, output, lengths, alphabet=ALPHABET, chunk_size=CHUNK_SIZE, column="palavra"):
+    alphabet = set(alphabet)
+    lengths = sorted(set(lengths))
+    stats = {"tokens": 0, "accepted": 0, "runs": 0, "words": {}}
+    os.makedirs(output, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=output) as folder:
+        runs = RunWriter(folder, lengths, chunk_size)
+        for source in sources:
+            for word in read_tokens(source, column):
+                stats["tokens"] += 1
+                if len(word) in runs.pending and alphabet.issuperset(word):
+                    stats["accepted"] += 1
+                    runs.add(word)
+        runs.spill()
+        for length in lengths:
+            stats["runs"] += len(runs.runs[length])
+            if runs.runs[length]:
+                path = functions.dictionary_path(length, output)
+                stats["words"][length] = merge_runs(runs.runs[length], path)
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera os dicionários por tamanho de palavra.")
+    parser.add_argument("sources", nargs="+", help="arquivos .txt, .csv ou .gz")
+    parser.add_argument("--output", default="data")
+    parser.add_argument("--lengths", default=",".join(map(str, functions.WORD_LENGTHS)))
+    parser.add_argument("--alphabet", default=ALPHABET)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="palavras únicas em memória antes de gravar um arquivo temporário")
+    parser.add_argument("--column", default="palavra", help="coluna das palavras nos csv")
+    parser.add_argument("--force", action="store_true", help="substitui dicionários que já existem")
+    args = parser.parse_args()
+
+    lengths = [int(length) for length in args.lengths.split(",")]
+    unknown = [length for length in lengths if length not in functions.WORD_LENGTHS]
+    if unknown:
+        parser.error(f"tamanhos suportados: {functions.WORD_LENGTHS}")
+    # substituir um dicionário invalida a tabela de padrões e rotaciona o log
+    # de eventos, então só com --force
+    existing = [functions.dictionary_path(length, args.output) for length in lengths
+                if os.path.exists(functions.dictionary_path(length, args.output))]
+    if existing and not args.force:
+        parser.error(f"{', '.join(existing)} já existe(m); use --force para substituir ou escolha outra --output")
+
+    start = time.perf_counter()
+    stats = ingest(args.sources, args.output, lengths, args.alphabet, args.chunk_size, args.column)
+    elapsed = time.perf_counter() - start
+    print(f"{stats['tokens']:,} palavras lidas, {stats['accepted']:,} aceitas, "
+          f"{stats['runs']} arquivos temporários, {elapsed:.1f}s")
+    for length in lengths:
+        if length in stats["words"]:
+            print(f"{functions.dictionary_path(length, args.output)}: {stats['words'][length]:,} palavras")
+        else:
+            print(f"nenhuma palavra de {length} letras")
+    return 0 if stats["words"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import functions
+
+# gerador de carga para server.py: várias conexões keep-alive jogando ao mesmo
+# tempo, medindo a latência de cada tentativa
+WORDS = "data/words.csv"
+
+class Client:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+        )
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    def close(self):
+        self.writer.close()
+
+async def player(client, words, rng, deadline, think_time, latencies, counters):
+    await client.connect()
+    while time.perf_counter() < deadline:
+        status, game = await client.request("POST", "/games", {})
+        counters["games"] += 1
+        path = f"/games/{game['id']}/guess"
+        finished = False
+        while not finished and time.perf_counter() < deadline:
+            if think_time > 0:
+                pause = rng.expovariate(1 / think_time)
+                await asyncio.sleep(min(pause, max(deadline - time.perf_counter(), 0)))
+            start = time.perf_counter()
+            status, state = await client.request("POST", path, {"word": rng.choice(words)})
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                counters["errors"] += 1
+                break
+            finished = state["finished"]
+        await client.request("DELETE", f"/games/{game['id']}")
+    client.close()
+
+def percentile(values, q):
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+async def run(args):
+    words, _ = functions.load_words(args.words)
+    words = list(words)
+    latencies = []
+    counters = {"games": 0, "errors": 0}
+    deadline = time.perf_counter() + args.duration
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        player(Client(args.host, args.port), words, random.Random(i), deadline, args.think_time,
+               latencies, counters)
+        for i in range(args.concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{args.concurrency} conexões, {counters['games']} partidas, {len(latencies)} tentativas "
+          f"em {elapsed:.1f}s ({len(latencies) / elapsed:,.0f} tentativas/s), {counters['errors']} erros")
+    if latencies:
+        print(f"latência por tentativa: p50 {percentile(latencies, 0.5) * 1000:.3f} ms, "
+              f"p90 {percentile(latencies, 0.9) * 1000:.3f} ms, p99 {percentile(latencies, 0.99) * 1000:.3f} ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gerador de carga para o servidor do Letreco.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--think-time", type=float, default=1.0,
+                        help="segundos médios entre tentativas de cada jogador (0 = sem pausa)")
+    parser.add_argument("--words", default=WORDS)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
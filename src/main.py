@@ -1,17 +1,46 @@
+import time
+STARTUP = time.perf_counter()
+
 import sys
+import functools
 import os
-import csv
-import random
+import logging
+import argparse
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QLabel, QLineEdit, QMessageBox, QFrame, QDialog, QDesktopWidget
+    QLabel, QLineEdit, QMessageBox, QDialog, QDesktopWidget, QComboBox, QCheckBox,
+    QGridLayout
 )
-from PyQt5.QtGui import QColor, QPalette, QIcon, QFont
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QColor, QPalette, QIcon, QFont, QPainter, QPen, QBrush
+from PyQt5.QtCore import Qt, QTimer, QThread, QRect, QSize, pyqtSignal
+import bitsets
+import difficulty
+import events
 import functions
+import history
+import patterns
+import profiling
+import rankings
+import session
+import solver
 
 ICON = "assets/icon.ico"
 RANKINGS = "data/rankings.csv"
+WORDS = "data/words.csv"
+# nos últimos segundos o relógio mostra décimos
+TENTHS_BELOW_MS = 10000
+
+logger = logging.getLogger("letreco")
+startup_phases = {}
+
+def mark_startup(phase):
+    # registra uma vez o tempo desde o início do processo até cada fase
+    if phase in startup_phases:
+        return
+    startup_phases[phase] = (time.perf_counter() - STARTUP) * 1000
+    logger.info("inicialização: %s em %.1f ms", phase, startup_phases[phase])
+
+mark_startup("imports")
 
 def change_font_size(old_font, size=16, bold=True):
     font = QFont()
@@ -45,15 +74,88 @@ def center_window(window):
     qr.moveCenter(cp)
     window.move(qr.topLeft())
 
+class DataLoader(QThread):
+    progress = pyqtSignal(str)
+    ready = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, filepath=WORDS):
+        super().__init__()
+        self.filepath = filepath
+        self.done = False
+        self.error = None
+
+    def run(self):
+        try:
+            self.progress.emit("Carregando palavras...")
+            words, _ = functions.load_words(self.filepath)
+            self.progress.emit("Indexando palavras...")
+            bitsets.get_index(words)
+        except ValueError:
+            self.error = "A lista de palavras está vazia."
+        except Exception:
+            self.error = "Erro ao carregar a lista de palavras."
+        if self.error is None and len(words) <= patterns.MAX_WORDS:
+            # tabela e índice são opcionais: sem eles o jogo roda sem dicas
+            # e com a dificuldade pela heurística (ex: pasta data sem escrita)
+            try:
+                self.progress.emit("Preparando dicas...")
+                patterns.load_table(self.filepath)
+                self.progress.emit("Medindo dificuldade...")
+                difficulty.load_index(self.filepath)
+            except Exception:
+                logger.warning("tabela de padrões ou índice de dificuldade indisponível", exc_info=True)
+        self.done = True
+        mark_startup("dados prontos")
+        if self.error is None:
+            self.ready.emit()
+        else:
+            self.failed.emit(self.error)
+
+_data_loaders = {}
+
+def start_data_loader(filepath=WORDS):
+    # um único carregamento em segundo plano por dicionário e processo
+    if filepath not in _data_loaders:
+        _data_loaders[filepath] = DataLoader(filepath)
+        _data_loaders[filepath].start()
+    return _data_loaders[filepath]
+
 class InitialScreen(QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Letreco - Menu Inicial")
-        self.setFixedSize(300, 200)
+        self.setFixedSize(300, 355)
         self.setWindowIcon(QIcon(ICON))
         self.setStyleSheet(BACKGROUND)
         self.init_ui()
 
+        self.loader = None
+        self.watch_loader()
+
+    def watch_loader(self):
+        # carrega em segundo plano o dicionário do tamanho escolhido; só o
+        # carregamento do tamanho atual fica conectado ao menu
+        if self.loader is not None:
+            self.loader.progress.disconnect(self.loader_progress)
+            self.loader.ready.disconnect(self.data_ready)
+            self.loader.failed.disconnect(self.data_failed)
+        self.loader = start_data_loader(functions.dictionary_path(self.length_box.currentData()))
+        self.btn_play.setEnabled(False)
+        self.btn_play.setText("Carregando palavras...")
+        self.loader.progress.connect(self.loader_progress)
+        self.loader.ready.connect(self.data_ready)
+        self.loader.failed.connect(self.data_failed)
+        if self.loader.done:
+            if self.loader.error is None:
+                self.data_ready()
+            else:
+                self.data_failed(self.loader.error)
+
+    def loader_progress(self, text):
+        if not self.loader.done:
+            self.btn_play.setText(text)
+
     def init_ui(self):
         layout = QVBoxLayout()
 
@@ -62,9 +164,35 @@ class InitialScreen(QWidget):
         change_font_size(title)
         layout.addWidget(title)
 
-        btn_play = QPushButton("Iniciar Jogo")
-        btn_play.clicked.connect(self.start_game)
-        layout.addWidget(btn_play)
+        self.length_box = QComboBox()
+        for length in functions.available_lengths() or [functions.WORD_LENGTH]:
+            self.length_box.addItem(f"{length} letras", length)
+        self.length_box.setCurrentIndex(max(self.length_box.findData(functions.WORD_LENGTH), 0))
+        self.length_box.currentIndexChanged.connect(self.watch_loader)
+        layout.addWidget(self.length_box)
+
+        self.level_box = QComboBox()
+        self.level_box.addItem("Dificuldade aleatória", None)
+        for level in difficulty.LEVELS:
+            self.level_box.addItem(level.capitalize(), level)
+        layout.addWidget(self.level_box)
+
+        self.accent_box = QCheckBox("Ignorar acentos")
+        layout.addWidget(self.accent_box)
+
+        self.adversarial_box = QCheckBox("Modo adversário")
+        layout.addWidget(self.adversarial_box)
+
+        self.boards_box = QComboBox()
+        self.boards_box.addItem("1 palavra", 1)
+        for boards in session.BOARD_COUNTS:
+            self.boards_box.addItem(f"{boards} palavras ao mesmo tempo", boards)
+        layout.addWidget(self.boards_box)
+
+        self.btn_play = QPushButton("Carregando palavras...")
+        self.btn_play.setEnabled(False)
+        self.btn_play.clicked.connect(self.start_game)
+        layout.addWidget(self.btn_play)
 
         btn_rules = QPushButton("Ver Regras")
         btn_rules.clicked.connect(self.show_rules)
@@ -78,16 +206,44 @@ class InitialScreen(QWidget):
         btn_exit.clicked.connect(self.close)
         layout.addWidget(btn_exit)
 
-        style_button(btn_play, "#4CAF50", "#45A049")
+        style_button(self.btn_play, "#4CAF50", "#45A049")
         style_button(btn_rules, "#2196F3", "#1976D2")
         style_button(btn_rankings, "#FFC107", "#FFB300", text_color="black")
         style_button(btn_exit, "#F44336", "#D32F2F")
 
         self.setLayout(layout)
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        mark_startup("primeira pintura")
+
+    def data_ready(self):
+        # um sinal já enfileirado pelo carregamento anterior não vale
+        if not self.loader.done or self.loader.error is not None:
+            return
+        self.btn_play.setText("Iniciar Jogo")
+        self.btn_play.setEnabled(True)
+
+    def data_failed(self, message):
+        if not self.loader.done or self.loader.error is None:
+            return
+        self.btn_play.setText("Erro ao carregar")
+        QMessageBox.critical(self, "Erro", message)
+        QApplication.exit(1)
+
     def start_game(self):
+        if not self.btn_play.isEnabled():
+            return
+        try:
+            self.jogo = LetrecoGame(level=self.level_box.currentData(),
+                                    accent_insensitive=self.accent_box.isChecked(),
+                                    length=self.length_box.currentData(),
+                                    adversarial=self.adversarial_box.isChecked(),
+                                    boards=self.boards_box.currentData())
+        except ValueError:
+            QMessageBox.warning(self, "Erro", "O dicionário não tem palavras suficientes para esse modo.")
+            return
         self.hide()
-        self.jogo = LetrecoGame()
         self.jogo.show()
         center_window(self.jogo)
 
@@ -105,7 +261,7 @@ class RulesWindow(QDialog):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Regras do Jogo")
-        self.setFixedSize(400, 200)
+        self.setFixedSize(400, 280)
         self.setWindowIcon(QIcon(ICON))
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint)
         self.setStyleSheet(BACKGROUND)
@@ -134,10 +290,13 @@ class RulesWindow(QDialog):
             layout.addLayout(line)
 
         instructions = QLabel(
-            "\nVocê tem 6 tentativas para adivinhar a palavra de 5 letras.\n"
+            "\nVocê tem 6 tentativas para adivinhar a palavra de 5 letras\n"
+            "(ou de 4, 6 e 7 letras, nos modos com dicionário próprio).\n"
             "Após a primeira tentativa você tem 60 segundos para acertar a palavra.\n"
             "Digite uma letra por campo e pressione Enter ou clique em Testar Palavra.\n"
-            "Letras com acento são consideradas DIFERENTES de letras sem acento."
+            "Letras com acento são consideradas DIFERENTES de letras sem acento,\n"
+            "exceto no modo Ignorar acentos.\n"
+            "No Modo adversário a palavra só é escolhida no fim, sempre fugindo das tentativas."
         )
         layout.addWidget(instructions)
 
@@ -168,6 +327,9 @@ class RankingsWindow(QDialog):
                 font-style: italic;
             }
         """)
+        self.history_store = history.get_store()
+        if self.history_store is not None:
+            self.setFixedSize(300, 380)
         self.init_ui()
 
     def init_ui(self):
@@ -177,20 +339,16 @@ class RankingsWindow(QDialog):
         label.setAlignment(Qt.AlignCenter)
         layout.addWidget(label)
 
-        path = RANKINGS
-        scores = []
+        store = rankings.get_store(RANKINGS)
 
-        if os.path.exists(path):
-            with open(path, newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                scores = [row[0] for row in reader][:10]
+        if self.history_store is not None:
+            self.init_history_ui(layout)
+        elif store.exists():
+            scores = store.top()
             for i in range(10):
                 if i < len(scores):
-                    try:
-                        name, score = scores[i].split("_")
-                        layout.addWidget(QLabel(f"{i+1}º - {name} → {score} pontos"))
-                    except ValueError:
-                        layout.addWidget(QLabel(f"{i+1}º - {scores[i]}"))  # fallback
+                    name, score = scores[i]
+                    layout.addWidget(QLabel(f"{i+1}º - {name} → {score} pontos"))
                 else:
                     layout.addWidget(QLabel(f"{i+1}º - "))
         else:
@@ -221,12 +379,81 @@ class RankingsWindow(QDialog):
 
         self.setLayout(layout)
 
+    def init_history_ui(self, layout):
+        self.filters = [
+            ("Todas", None, None),
+            ("Hoje", "hoje", None),
+            ("Fácil", None, "FÁCIL"),
+            ("Média", None, "MÉDIA"),
+            ("Difícil", None, "DIFÍCIL"),
+            ("Impossível", None, "IMPOSSÍVEL"),
+        ]
+        self.filter_box = QComboBox()
+        self.filter_box.addItems([name for name, _, _ in self.filters])
+        self.filter_box.currentIndexChanged.connect(self.reset_pages)
+        layout.addWidget(self.filter_box)
+
+        self.rank_labels = []
+        for i in range(history.PAGE_SIZE):
+            rank_label = QLabel()
+            self.rank_labels.append(rank_label)
+            layout.addWidget(rank_label)
+
+        page_layout = QHBoxLayout()
+        self.prev_button = QPushButton("◀ Anterior")
+        self.prev_button.clicked.connect(self.previous_page)
+        page_layout.addWidget(self.prev_button)
+        self.next_button = QPushButton("Próxima ▶")
+        self.next_button.clicked.connect(self.next_page)
+        page_layout.addWidget(self.next_button)
+        layout.addLayout(page_layout)
+
+        self.reset_pages()
+
+    def reset_pages(self):
+        # cursores (score, id) do fim de cada página já vista
+        self.cursors = [None]
+        self.load_page()
+
+    def load_page(self):
+        _, day, difficulty = self.filters[self.filter_box.currentIndex()]
+        if day == "hoje":
+            day = time.strftime("%Y-%m-%d")
+        # busca uma linha a mais só para saber se existe próxima página
+        rows = self.history_store.page(self.cursors[-1], day, difficulty, history.PAGE_SIZE + 1)
+        self.page_rows = rows[:history.PAGE_SIZE]
+        first = (len(self.cursors) - 1) * history.PAGE_SIZE
+        for i, rank_label in enumerate(self.rank_labels):
+            if i < len(self.page_rows):
+                _, name, score = self.page_rows[i]
+                rank_label.setText(f"{first + i + 1}º - {name} → {score} pontos")
+            else:
+                rank_label.setText(f"{first + i + 1}º - ")
+        self.prev_button.setEnabled(len(self.cursors) > 1)
+        self.next_button.setEnabled(len(rows) > history.PAGE_SIZE)
+
+    def next_page(self):
+        row_id, _, score = self.page_rows[-1]
+        self.cursors.append((score, row_id))
+        self.load_page()
+
+    def previous_page(self):
+        self.cursors.pop()
+        self.load_page()
+
     def try_delete_rankings(self):
         password = self.password_input.text().strip()
         if password == "SpSterne0813":
-            path = RANKINGS
-            if os.path.exists(path):
-                os.remove(path)
+            store = rankings.get_store(RANKINGS)
+            if self.history_store is not None and self.history_store.has_scores():
+                self.history_store.clear_rankings()
+                QMessageBox.information(self, "Pontuações apagadas", "As pontuações foram apagadas.")
+                self.close()
+                nova_janela = RankingsWindow()
+                QTimer.singleShot(0, lambda: center_window(nova_janela))
+                nova_janela.exec_()
+            elif self.history_store is None and store.exists():
+                store.clear()
                 QMessageBox.information(self, "Arquivo apagado", "As pontuações foram apagadas.")
                 self.close()
                 nova_janela = RankingsWindow()
@@ -237,17 +464,147 @@ class RankingsWindow(QDialog):
         else:
             QMessageBox.warning(self, "Senha incorreta", "Senha inválida. Tente novamente.")
 
+class HintWorker(QThread):
+    hint_ready = pyqtSignal(object, object)
+
+    def __init__(self, game_solver, history, word_list, filepath=WORDS):
+        super().__init__()
+        self.solver = game_solver
+        self.history = history
+        self.word_list = word_list
+        self.filepath = filepath
+
+    def run(self):
+        if self.solver is None:
+            try:
+                table = patterns.load_table(self.filepath)
+            except Exception:
+                # sem tabela (ex: pasta data sem escrita) não há dicas
+                logger.warning("tabela de padrões indisponível para a dica", exc_info=True)
+                self.hint_ready.emit(None, None)
+                return
+            self.solver = solver.Solver(table, self.word_list)
+            for word, result in self.history:
+                self.solver.update(word, result)
+        hint = self.solver.best_guess(should_stop=self.isInterruptionRequested)
+        if not self.isInterruptionRequested():
+            self.hint_ready.emit(self.solver, hint)
+
+# cores por código de status (functions.INEXISTENTE, EXISTE, CORRETA)
+FEEDBACK_COLORS = ("lightgray", "yellow", "green")
+@functools.lru_cache(maxsize=None)
+def pattern_status(length):
+    # status de cada posição para cada código de padrão (243 com 5 letras)
+    return [
+        tuple(functions.STATUS_NAMES.index(status) for status in functions.decode_pattern(code, length))
+        for code in range(functions.n_patterns(length))
+    ]
+
+class HistoryBoard(QWidget):
+    CELL_WIDTH = 40
+    CELL_HEIGHT = 28
+    SPACING = 6
+
+    def __init__(self, columns=5, parent=None, compact=False):
+        super().__init__(parent)
+        if compact:
+            # células menores para caber várias palavras lado a lado
+            self.CELL_WIDTH, self.CELL_HEIGHT, self.SPACING = 26, 22, 4
+        self.columns = columns
+        self.statuses = pattern_status(columns)
+        self.words = []
+        self.codes = []
+        # pincéis, caneta e fonte criados uma vez e reaproveitados em toda pintura
+        self.brushes = [QBrush(QColor(color)) for color in FEEDBACK_COLORS]
+        self.pen = QPen(QColor("#A0A0A0"))
+        self.text_pen = QPen(QColor("black"))
+        self.cell_font = QFont(self.font())
+        self.cell_font.setBold(True)
+
+    def row_height(self):
+        return self.CELL_HEIGHT + self.SPACING
+
+    def row_width(self):
+        return self.columns * self.CELL_WIDTH + (self.columns - 1) * self.SPACING
+
+    def sizeHint(self):
+        return QSize(self.row_width(), max(len(self.words) * self.row_height() - self.SPACING, 0))
+
+    def minimumSizeHint(self):
+        return self.sizeHint()
+
+    def add_row(self, word, code):
+        self.words.append(word.upper())
+        self.codes.append(code)
+        self.updateGeometry()
+        top = (len(self.words) - 1) * self.row_height()
+        self.update(0, top, self.width(), self.CELL_HEIGHT)
+
+    def clear(self):
+        self.words.clear()
+        self.codes.clear()
+        self.updateGeometry()
+        self.update()
+
+    def paintEvent(self, event):
+        if not self.words:
+            return
+        painter = QPainter(self)
+        painter.setFont(self.cell_font)
+        left = (self.width() - self.row_width()) // 2
+        row_height = self.row_height()
+        # só pinta as linhas dentro da área que precisa ser redesenhada
+        area = event.rect()
+        first = max(area.top() // row_height, 0)
+        last = min(area.bottom() // row_height + 1, len(self.words))
+        for row in range(first, last):
+            top = row * row_height
+            word = self.words[row]
+            statuses = self.statuses[self.codes[row]]
+            for col in range(self.columns):
+                rect = QRect(left + col * (self.CELL_WIDTH + self.SPACING), top, self.CELL_WIDTH, self.CELL_HEIGHT)
+                painter.setPen(self.pen)
+                painter.setBrush(self.brushes[statuses[col]])
+                painter.drawRect(rect.adjusted(0, 0, -1, -1))
+                painter.setPen(self.text_pen)
+                painter.drawText(rect, Qt.AlignCenter, word[col])
+        painter.end()
+
 class LetrecoGame(QWidget):
-    def __init__(self):
+    def __init__(self, game_session=None, level=None, accent_insensitive=False, length=functions.WORD_LENGTH,
+                 adversarial=False, boards=1):
         super().__init__()
         self.setWindowTitle("Letreco")
         self.setWindowIcon(QIcon(ICON))
+        self.length = length
+        self.words_path = functions.dictionary_path(length)
         self.word_list, self.word_set = self.load_words()
-        self.chosen_word = random.choice(self.word_list)
-        self.attempts = 0
-        self.max_attempts = 6
-        self.seconds_remaining = 60
+        self.level = level
+        self.accent_insensitive = accent_insensitive
+        # várias palavras ao mesmo tempo não combinam com o modo adversário
+        self.boards = boards
+        self.adversarial = adversarial and boards == 1
+        self.difficulty_index = self.load_difficulty_index()
+        self.event_log = events.get_log(self.words_path)
+        self.bitset_index = bitsets.get_index(self.word_list)
+        self.candidate_masks = [self.bitset_index.full] * boards
+        if game_session is None:
+            game_session = self.new_session()
+        self.session = game_session
+        self.game_id = events.new_game_id()
+        # disparo único reagendado a cada mudança do valor mostrado; o tempo
+        # vem sempre do relógio da sessão, então ticks atrasados não dão tempo extra
         self.visual_timer = QTimer()
+        self.visual_timer.setSingleShot(True)
+        self.visual_timer.setTimerType(Qt.PreciseTimer)
+        self.tick_monitor = profiling.tick_monitor("visual_timer", 1000)
+        if self.tick_monitor is not None:
+            self.visual_timer.timeout.connect(self.tick_monitor.tick)
+        self.visual_timer.timeout.connect(self.update_timer)
+        self.history = []
+        self.solver = None
+        self.hint_worker = None
+        self.running_workers = set()
 
         self.setObjectName("game")
         self.setStyleSheet("""
@@ -259,7 +616,7 @@ class LetrecoGame(QWidget):
 
     def load_words(self):
         try:
-            return functions.load_words('data/words.csv')
+            return functions.load_words(self.words_path)
         except ValueError:
             QMessageBox.critical(self, "Erro", "A lista de palavras está vazia.")
             sys.exit()
@@ -267,31 +624,65 @@ class LetrecoGame(QWidget):
             QMessageBox.critical(self, "Erro ao carregar a lista de palavras.")
             sys.exit()
 
-    def init_ui(self):
-        layout = QVBoxLayout()
-
-        difficulty = functions.classify_difficulty(self.chosen_word)
+    def difficulty_text(self):
+        difficulty = self.session.difficulty()
         cores = {
             "FÁCIL": "#4CAF50",   
             "MÉDIA": "#FF9800",
             "DIFÍCIL": "#F44336",
-            "IMPOSSÍVEL": "#6A1B9A"
+            "IMPOSSÍVEL": "#6A1B9A",
+            session.ADVERSARIAL: "#B71C1C",
         }
 
         cor = cores.get(difficulty, "black")
-        self.difficulty_label = QLabel(f'Dificuldade: <span style="color:{cor}; font-weight:bold;">{difficulty}</span>')
+        return f'Dificuldade: <span style="color:{cor}; font-weight:bold;">{difficulty}</span>'
+
+    def load_difficulty_index(self):
+        # sem o índice a dificuldade volta a ser a heurística de classify_difficulty
+        try:
+            return difficulty.load_index(self.words_path)
+        except Exception:
+            return None
+
+    def load_table(self):
+        # no modo adversário a tabela de padrões evita recalcular as comparações
+        if not self.adversarial or len(self.word_list) > patterns.MAX_WORDS:
+            return None
+        try:
+            return patterns.load_table(self.words_path)
+        except Exception:
+            return None
+
+    def new_session(self):
+        level = self.level if self.difficulty_index is not None else None
+        if self.boards > 1:
+            return session.MultiBoardSession(self.word_list, self.word_set, boards=self.boards,
+                                             difficulty_index=self.difficulty_index, level=level,
+                                             accent_insensitive=self.accent_insensitive)
+        return session.GameSession(self.word_list, self.word_set,
+                                   difficulty_index=self.difficulty_index, level=level,
+                                   accent_insensitive=self.accent_insensitive,
+                                   adversarial=self.adversarial, table=self.load_table())
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        self.difficulty_label = QLabel(self.difficulty_text())
         layout.addWidget(self.difficulty_label)
 
-        self.info_label = QLabel(f"Tentativas restantes: {self.max_attempts - self.attempts}")
+        self.info_label = QLabel(f"Tentativas restantes: {self.session.attempts_left()}")
         layout.addWidget(self.info_label)
 
         self.time_label = QLabel("⏱️ Tempo restante:")
         layout.addWidget(self.time_label)
 
+        self.candidates_label = QLabel("")
+        layout.addWidget(self.candidates_label)
+
 
         self.input_fields = []
         input_layout = QHBoxLayout()
-        for i in range(5):
+        for i in range(self.length):
             field = QLineEdit()
             field.setMaxLength(1)
             field.setFixedWidth(40)
@@ -302,6 +693,16 @@ class LetrecoGame(QWidget):
             input_layout.addWidget(field)
         layout.addLayout(input_layout)
 
+        self.completions_label = QLabel("")
+        self.completions_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.completions_label)
+        self.default_palette = QPalette(self.input_fields[0].palette())
+        self.feedback_palettes = []
+        for color in FEEDBACK_COLORS:
+            palette = QPalette(self.default_palette)
+            palette.setColor(QPalette.Base, QColor(color))
+            self.feedback_palettes.append(palette)
+
         self.submit_button = QPushButton("Testar Palavra")
         style_button(self.submit_button, "#4CAF50", "#45A049")
         self.submit_button.setEnabled(False)
@@ -309,16 +710,30 @@ class LetrecoGame(QWidget):
         self.submit_button.setDefault(True)
         layout.addWidget(self.submit_button)
 
+        self.hint_button = QPushButton("Dica")
+        style_button(self.hint_button, "#2196F3", "#1976D2")
+        self.hint_button.clicked.connect(self.request_hint)
+        self.hint_button.setVisible(self.boards == 1 and len(self.word_list) <= patterns.MAX_WORDS)
+        layout.addWidget(self.hint_button)
+
+        self.hint_label = QLabel("")
+        self.hint_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.hint_label)
+
         self.voltar_button = QPushButton("Voltar ao Menu")
         style_button(self.voltar_button, "#F44336", "#D32F2F")
         self.voltar_button.clicked.connect(self.return_to_menu)
         layout.addWidget(self.voltar_button)
 
-        self.history_layout = QVBoxLayout()
-        history_frame = QFrame()
-        history_frame.setLayout(self.history_layout)
+        # um quadro por palavra, até quatro por linha
+        self.history_boards = [HistoryBoard(self.length, compact=self.boards > 1) for _ in range(self.boards)]
+        self.history_board = self.history_boards[0]
         layout.addWidget(QLabel("Tentativas anteriores:"))
-        layout.addWidget(history_frame)
+        boards_layout = QGridLayout()
+        boards_layout.setHorizontalSpacing(16)
+        for i, board in enumerate(self.history_boards):
+            boards_layout.addWidget(board, i // 4, i % 4, Qt.AlignTop)
+        layout.addLayout(boards_layout)
 
         self.setLayout(layout)
         self.input_fields[0].setFocus()
@@ -326,54 +741,124 @@ class LetrecoGame(QWidget):
     def update_button_state(self):
         filled = all(field.text().strip() for field in self.input_fields)
         self.submit_button.setEnabled(filled)
+        self.update_completions()
+
+    def update_completions(self):
+        # prefixo = letras digitadas desde o primeiro campo até o primeiro vazio
+        prefix = ""
+        for field in self.input_fields:
+            letter = field.text().strip().lower()
+            if not letter:
+                break
+            prefix += letter
+        if not prefix:
+            self.completions_label.setText("")
+            return
+        index = self.session.folded_index if self.session.folded_index is not None else self.word_list
+        count, words = index.completions(prefix)
+        if count == 0:
+            self.completions_label.setText(
+                f'<span style="color:#D32F2F;">✖ Nenhuma palavra começa com {prefix.upper()}</span>')
+        elif len(prefix) == self.length:
+            self.completions_label.setText('<span style="color:#2E7D32;">✔ Palavra válida</span>')
+        else:
+            more = "…" if count > len(words) else ""
+            self.completions_label.setText(f"{count} palavras: {', '.join(words).upper()}{more}")
 
     def handle_enter(self, index):
-        if index < 4:
+        if index < self.length - 1:
             self.input_fields[index + 1].setFocus()
         else:
             if self.submit_button.isEnabled():
                 self.check_input()
 
-    def check_input(self):
-        user_word = ''.join([field.text().lower() for field in self.input_fields])
-        if len(user_word) != 5:
-            QMessageBox.warning(self, "Erro", "A palavra deve ter 5 letras.")
+    def request_hint(self):
+        if self.hint_worker is not None:
+            return
+        self.hint_button.setEnabled(False)
+        self.hint_label.setText("💡 Calculando dica...")
+        worker = HintWorker(self.solver, list(self.history), self.word_list, self.words_path)
+        worker.hint_ready.connect(self.show_hint)
+        worker.finished.connect(lambda w=worker: self.running_workers.discard(w))
+        self.running_workers.add(worker)
+        self.hint_worker = worker
+        worker.start()
+
+    def cancel_hint(self):
+        if self.hint_worker is not None:
+            self.hint_worker.requestInterruption()
+            self.hint_worker = None
+            self.hint_button.setEnabled(True)
+            self.hint_label.setText("")
+
+    def show_hint(self, game_solver, hint):
+        if self.sender() is not self.hint_worker:
+            return
+        self.hint_worker = None
+        if game_solver is None:
+            self.hint_label.setText("💡 Dicas indisponíveis.")
             return
+        self.solver = game_solver
+        # tentativas feitas enquanto a dica era calculada
+        for word, result in self.history[game_solver.applied:]:
+            game_solver.update(word, result)
+        self.hint_button.setEnabled(True)
+        if hint is None:
+            self.hint_label.setText("💡 Nenhuma palavra possível.")
+        else:
+            self.hint_label.setText(f"💡 Dica: {hint.upper()}")
 
-        if user_word not in self.word_set:
-            QMessageBox.warning(self, "Erro", "Essa palavra não é válida.")
+    def check_input(self):
+        user_word = ''.join([field.text().lower() for field in self.input_fields])
+        error = self.session.validate(user_word)
+        if error is not None:
+            QMessageBox.warning(self, "Erro", error)
             return
+        user_word = self.session.resolve(user_word)
 
         try:
-            result = functions.check_word(self.chosen_word, user_word)
+            result = self.session.guess(user_word)
         except ValueError:
-            QMessageBox.critical(self, "Erro", "A palavra a ser adivinhada não tem 5 letras.")
+            if self.session.finished:
+                self.update_timer()
+                return
+            QMessageBox.critical(self, "Erro", f"A palavra a ser adivinhada não tem {self.length} letras.")
             return
         except Exception:
             QMessageBox.critical(self, "Erro", "Ocorreu um erro ao comparar as palavras.")
+            return
 
-        self.attempts += 1
-        self.info_label.setText(f"Tentativas restantes: {self.max_attempts - self.attempts}")
-        if self.attempts == 1:
-            self.visual_timer.timeout.connect(self.update_timer)
-            self.visual_timer.start(1000)
-            self.time_label.setText(f"⏱️ Tempo restante: 60s")
-        self.color_feedback(result)
-        self.add_to_history(user_word, result)
+        self.cancel_hint()
+        if self.session.won:
+            self.log_event(events.WIN, user_word, result)
+        elif self.session.finished:
+            self.log_event(events.LOSS, user_word, result)
+        else:
+            self.log_event(events.GUESS, user_word, result)
+        self.info_label.setText(f"Tentativas restantes: {self.session.attempts_left()}")
+        if self.session.attempts == 1 and not self.session.finished:
+            self.update_timer()
+        if self.boards == 1:
+            self.color_feedback(result)
+            self.add_to_history(user_word, result)
+        else:
+            self.add_to_boards(user_word, result)
 
-        if user_word == self.chosen_word:
+        if self.session.won:
             self.visual_timer.stop()
-            time = 60 - self.seconds_remaining
-            score = max(1000 - (self.attempts - 1) * 100 - time * 5, 0)
+            score = self.session.score
             dialog = ScoreDialog(score, self)
             QTimer.singleShot(0, lambda: center_window(dialog))
+            initials = None
             if dialog.exec_() == QDialog.Accepted:
                 initials = dialog.get_initials()
-                self.save_score(f"{initials}_{score}")
+            dialog.deleteLater()
+            self.finish_game(initials)
             self.restart_game()
-        elif self.attempts >= self.max_attempts:
+        elif self.session.finished:
             self.visual_timer.stop()
-            QMessageBox.information(self, "Fim de jogo", f"A palavra era: {self.chosen_word}")
+            self.finish_game()
+            QMessageBox.information(self, "Fim de jogo", self.answer_text())
             self.restart_game()
         else:
             for field in self.input_fields:
@@ -382,72 +867,133 @@ class LetrecoGame(QWidget):
             self.update_button_state()
 
     def update_timer(self):
-        self.seconds_remaining -= 1
-        self.time_label.setText(f"⏱️ Tempo restante: {self.seconds_remaining}s")
-        if self.seconds_remaining <= 0:
+        remaining = self.session.remaining_ms()
+        if remaining > TENTHS_BELOW_MS:
+            self.time_label.setText(f"⏱️ Tempo restante: {-(-remaining // 1000)}s")
+            delay = remaining % 1000 or 1000
+        else:
+            self.time_label.setText(f"⏱️ Tempo restante: {-(-remaining // 100) / 10:.1f}s")
+            delay = remaining % 100 or 100
+        if not self.session.check_timeout():
+            self.visual_timer.start(delay)
+            if self.tick_monitor is not None:
+                self.tick_monitor.start(delay)
+        else:
             self.visual_timer.stop()
-            QMessageBox.information(self, "Tempo esgotado", f"⏱️ Você perdeu! A palavra era: {self.chosen_word}")
+            self.log_event(events.TIMEOUT)
+            self.finish_game()
+            QMessageBox.information(self, "Tempo esgotado", f"⏱️ Você perdeu! {self.answer_text()}")
             self.restart_game()
 
     def color_feedback(self, result):
         for i, status in enumerate(result):
-            palette = self.input_fields[i].palette()
-            if status == "correta":
-                palette.setColor(QPalette.Base, QColor("green"))
-            elif status == "existe":
-                palette.setColor(QPalette.Base, QColor("yellow"))
-            else:
-                palette.setColor(QPalette.Base, QColor("lightgray"))
-            self.input_fields[i].setPalette(palette)
+            self.input_fields[i].setPalette(self.feedback_palettes[functions.STATUS_NAMES.index(status)])
 
     def add_to_history(self, word, result):
-        row_layout = QHBoxLayout()
-        for i, letter in enumerate(word):
-            label = QLineEdit(letter.upper())
-            label.setReadOnly(True)
-            label.setFixedWidth(40)
-            label.setAlignment(Qt.AlignCenter)
-            palette = label.palette()
-            if result[i] == "correta":
-                palette.setColor(QPalette.Base, QColor("green"))
-            elif result[i] == "existe":
-                palette.setColor(QPalette.Base, QColor("yellow"))
+        self.history.append((word, result))
+        if self.solver is not None:
+            self.solver.update(word, result)
+        self.history_board.add_row(word, functions.encode_pattern(result))
+        self.update_candidates(word, [result])
+
+    def add_to_boards(self, word, codes):
+        # uma linha só nos quadros ainda abertos (código None = já acertada antes)
+        results = []
+        for board, code in zip(self.history_boards, codes):
+            if code is None:
+                results.append(None)
             else:
-                palette.setColor(QPalette.Base, QColor("lightgray"))
-            label.setPalette(palette)
-            row_layout.addWidget(label)
-        self.history_layout.addLayout(row_layout)
+                board.add_row(word, code)
+                results.append(functions.decode_pattern(code, self.length))
+        self.update_candidates(word, results)
+
+    def update_candidates(self, word, results):
+        counts = []
+        for i, result in enumerate(results):
+            if result is not None:
+                self.candidate_masks[i] = self.bitset_index.constrain(self.candidate_masks[i], word, result)
+            counts.append(self.bitset_index.count(self.candidate_masks[i]))
+        if self.boards == 1:
+            count = counts[0]
+            self.candidates_label.setText("1 palavra possível" if count == 1 else f"{count} palavras possíveis")
+        else:
+            solved = self.session.solved
+            self.candidates_label.setText("Palavras possíveis: " + " · ".join(
+                "✔" if solved[i] else str(count) for i, count in enumerate(counts)))
+
+    def answer_text(self):
+        if self.boards == 1:
+            return f"A palavra era: {self.session.chosen_word}"
+        return f"As palavras eram: {self.session.chosen_word}"
+
+    def finish_game(self, initials=None):
+        # com LETRECO_DB toda partida vai para o histórico; sem ele só as
+        # vitórias com iniciais entram em rankings.csv
+        store = history.get_store()
+        if store is not None:
+            store.record(self.session, initials)
+        elif initials:
+            self.save_score(f"{initials}_{self.session.score}")
 
     def save_score(self, score):
-        caminho = RANKINGS
-        os.makedirs("data", exist_ok=True)
-        rankings = []
-
-        if os.path.exists(caminho):
-            with open(caminho, newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                rankings = [row[0] for row in reader]
+        rankings.get_store(RANKINGS).add(str(score))
 
-        rankings.append(str(score))
-        rankings = sorted(rankings, key=lambda x: int(x.split("_")[1]), reverse=True)[:10]
-
-        with open(caminho, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            for score in rankings:
-                writer.writerow([score])
+    def log_event(self, kind, word=None, result=None):
+        # o log mede as palavras sorteadas, uma por partida: fica de fora o modo
+        # de várias palavras e o adversário, cuja palavra só é escolhida no fim
+        if self.event_log is None or self.boards > 1 or self.session.adversarial:
+            return
+        try:
+            self.event_log.write(
+                self.game_id, self.word_list.index(self.session.chosen_word), kind,
+                guess=events.NO_WORD if word is None else self.word_list.index(word),
+                pattern=0 if result is None else functions.encode_pattern(result),
+                attempt=self.session.attempts, elapsed_ms=self.session.elapsed_ms())
+        except OSError:
+            # sem espaço ou sem permissão: o jogo continua sem o log
+            self.event_log = None
 
     def return_to_menu(self):
         self.visual_timer.stop()
+        self.cancel_hint()
+        if self.session.attempts > 0 and not self.session.finished:
+            self.log_event(events.ABANDON)
         self.close()
         self.menu = InitialScreen()
         self.menu.show()
         center_window(self.menu)
 
     def restart_game(self):
-        self.close()
-        nova_partida = LetrecoGame()
-        nova_partida.show()
-        center_window(nova_partida)
+        self.reset_game()
+
+    def reset_game(self, game_session=None):
+        # nova rodada na mesma janela, reaproveitando todos os widgets
+        self.visual_timer.stop()
+        self.cancel_hint()
+        if game_session is None:
+            game_session = self.new_session()
+        self.session = game_session
+        self.game_id = events.new_game_id()
+        self.history.clear()
+        if self.solver is not None:
+            self.solver.reset()
+
+        self.difficulty_label.setText(self.difficulty_text())
+        self.info_label.setText(f"Tentativas restantes: {self.session.attempts_left()}")
+        self.time_label.setText("⏱️ Tempo restante:")
+        self.candidate_masks = [self.bitset_index.full] * self.boards
+        self.candidates_label.setText("")
+        self.hint_label.setText("")
+        for field in self.input_fields:
+            field.blockSignals(True)
+            field.clear()
+            field.blockSignals(False)
+            field.setPalette(self.default_palette)
+        for board in self.history_boards:
+            board.clear()
+        self.update_button_state()
+        self.adjustSize()
+        self.input_fields[0].setFocus()
 
 class ScoreDialog(QDialog):
     def __init__(self, score, parent=None):
@@ -521,8 +1067,26 @@ class ScoreDialog(QDialog):
         else:
             event.ignore()
 
+def enable_profiling(path):
+    profiling.enable(path)
+    profiling.instrument(LetrecoGame, [
+        "check_input", "color_feedback", "add_to_history", "add_to_boards", "update_timer",
+        "save_score", "finish_game", "restart_game",
+    ])
+    profiling.instrument(HistoryBoard, ["paintEvent"])
+    profiling.instrument(functions, ["check_word"])
+    logger.info("instrumentação ativa, gravando em %s", path)
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--profile", default=os.environ.get(profiling.ENV_VAR),
+                        help="grava tempos das funções (.json = trace do Chrome, senão JSON lines)")
+    options, qt_args = parser.parse_known_args()
+    if options.profile:
+        enable_profiling(options.profile)
+    app = QApplication(sys.argv[:1] + qt_args)
+    mark_startup("QApplication")
     menu = InitialScreen()
     menu.show()
     center_window(menu)
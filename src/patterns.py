@@ -0,0 +1,81 @@
+import glob
+import hashlib
+import os
+import sys
+import numpy as np
+import caches
+import functions
+
+# tabela tentativa × resposta com os códigos de check_word_batch, salva ao lado
+# do dicionário e aberta por memory map (compartilhada entre processos)
+BLOCK_SIZE = 64
+# a tabela cresce com n²: acima disso (ex: dicionários gerados de corpora
+# grandes) dicas e dificuldade medida ficam desligadas
+MAX_WORDS = 12000
+
+# tabelas abertas, pelo caminho do arquivo da tabela
+_tables = caches.KeyedCache()
+
+def words_hash(filepath):
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+def cache_path(filepath, prefix):
+    # um arquivo por dicionário (words, words_6, ...), trocado quando o conteúdo muda
+    folder = os.path.dirname(os.path.abspath(filepath))
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    return os.path.join(folder, f"{prefix}_{stem}_{words_hash(filepath)}.bin")
+
+def remove_stale(path):
+    # apaga as versões antigas do mesmo arquivo de cache (o hash tem 16
+    # dígitos, então "words" não pega os arquivos de "words_6")
+    for old in glob.glob(path.rsplit("_", 1)[0] + "_" + "[0-9a-f]" * 16 + ".bin"):
+        if old != path:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+def table_path(filepath):
+    return cache_path(filepath, "patterns")
+
+def build_table(words):
+    matrix = functions.encode_words(words)
+    dtype = functions.pattern_dtype(matrix.shape[1])
+    table = np.empty((len(words), len(words)), dtype=dtype)
+    for start in range(0, len(words), BLOCK_SIZE):
+        block = matrix[start:start + BLOCK_SIZE]
+        table[start:start + len(block)] = functions.pattern_matrix(block, matrix)
+    return table
+
+def save_table(table, path):
+    # grava em arquivo temporário e renomeia, para nenhum processo abrir
+    # uma tabela pela metade
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(table.tobytes())
+    os.replace(tmp, path)
+    remove_stale(path)
+
+def load_table(filepath):
+    path = table_path(filepath)
+    return _tables.get(path, lambda: open_table(filepath, path))
+
+def open_table(filepath, path):
+    words, _ = functions.load_words(filepath)
+    n = len(words)
+    if n > MAX_WORDS:
+        raise ValueError(f"Too many words for a pattern table ({n} > {MAX_WORDS}).")
+    dtype = functions.pattern_dtype(words.length)
+    if not os.path.exists(path) or os.path.getsize(path) != n * n * np.dtype(dtype).itemsize:
+        save_table(build_table(words), path)
+
+    return np.memmap(path, dtype=dtype, mode='r', shape=(n, n))
+
+if __name__ == "__main__":
+    filepath = sys.argv[1] if len(sys.argv) > 1 else 'data/words.csv'
+    table = load_table(filepath)
+    print(f"{table_path(filepath)}: {table.shape[0]}×{table.shape[1]}")
@@ -0,0 +1,141 @@
+import atexit
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+
+# instrumentação opcional: só substitui os métodos quando ativada (pela variável
+# LETRECO_PROFILE ou por --profile), então desligada não custa nada
+ENV_VAR = "LETRECO_PROFILE"
+STALL_MS = 100
+
+recorder = None
+
+class Recorder:
+    def __init__(self, path):
+        self.path = path
+        self.chrome = path.endswith(".json")
+        self.start = time.perf_counter()
+        self.durations = {}
+        self.stalls = []
+        self.lock = threading.Lock()
+        self.file = open(path, 'w', encoding='utf-8')
+        self.first = True
+        if self.chrome:
+            self.file.write('{"traceEvents": [\n')
+
+    def write(self, event):
+        if self.chrome:
+            if not self.first:
+                self.file.write(",\n")
+            self.file.write(json.dumps(event))
+        else:
+            self.file.write(json.dumps(event) + "\n")
+        self.first = False
+
+    def record(self, name, start, duration, args=None):
+        with self.lock:
+            self.durations.setdefault(name, []).append(duration)
+            event = {
+                "name": name,
+                "ph": "X",
+                "ts": round((start - self.start) * 1e6, 1),
+                "dur": round(duration * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+            if args:
+                event["args"] = args
+            self.write(event)
+
+    def record_stall(self, name, expected_ms, actual_ms):
+        with self.lock:
+            self.stalls.append(actual_ms - expected_ms)
+            self.write({
+                "name": f"{name} atrasado",
+                "ph": "i",
+                "s": "g",
+                "ts": round((time.perf_counter() - self.start) * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": {"esperado_ms": expected_ms, "real_ms": round(actual_ms, 1)},
+            })
+
+    def summary(self):
+        lines = [f"{'função':<28} {'chamadas':>8} {'total ms':>10} {'p50 ms':>9} {'p99 ms':>9} {'máx ms':>9}"]
+        for name, values in sorted(self.durations.items(), key=lambda item: -sum(item[1])):
+            values = sorted(values)
+            p50 = values[len(values) // 2] * 1000
+            p99 = values[min(int(len(values) * 0.99), len(values) - 1)] * 1000
+            lines.append(f"{name:<28} {len(values):>8} {sum(values) * 1000:>10.1f} {p50:>9.2f} {p99:>9.2f} {values[-1] * 1000:>9.2f}")
+        if self.stalls:
+            lines.append(f"travamentos do laço de eventos: {len(self.stalls)}, pior atraso {max(self.stalls):.0f} ms")
+        else:
+            lines.append("nenhum travamento do laço de eventos detectado")
+        return "\n".join(lines)
+
+    def close(self):
+        with self.lock:
+            if self.chrome:
+                self.file.write("\n]}\n")
+            self.file.close()
+        print(self.summary(), file=sys.stderr)
+
+class TickMonitor:
+    # compara o intervalo esperado de um QTimer com o intervalo real entre ticks
+    def __init__(self, name, interval_ms):
+        self.name = name
+        self.interval_ms = interval_ms
+        self.last = None
+
+    def start(self, interval_ms=None):
+        if interval_ms is not None:
+            self.interval_ms = interval_ms
+        self.last = time.perf_counter()
+
+    def tick(self):
+        now = time.perf_counter()
+        if self.last is not None:
+            actual_ms = (now - self.last) * 1000
+            if actual_ms - self.interval_ms > STALL_MS:
+                recorder.record_stall(self.name, self.interval_ms, actual_ms)
+        self.last = now
+
+def enable(path):
+    global recorder
+    if recorder is None:
+        recorder = Recorder(path)
+        atexit.register(recorder.close)
+    return recorder
+
+def enabled():
+    return recorder is not None
+
+def tick_monitor(name, interval_ms):
+    return TickMonitor(name, interval_ms) if recorder is not None else None
+
+def timed(name, func):
+    # repassa só os argumentos que a função aceita, porque sinais do Qt
+    # mandam argumentos extras (ex: "checked" de clicked)
+    params = inspect.signature(func).parameters.values()
+    if any(p.kind == p.VAR_POSITIONAL for p in params):
+        limit = None
+    else:
+        limit = sum(p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in params)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args[:limit], **kwargs)
+        finally:
+            recorder.record(name, start, time.perf_counter() - start)
+    return wrapper
+
+def instrument(owner, names):
+    prefix = getattr(owner, "__name__", str(owner))
+    for name in names:
+        setattr(owner, name, timed(f"{prefix}.{name}", getattr(owner, name)))
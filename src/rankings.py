@@ -0,0 +1,137 @@
+import heapq
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# rankings.csv vira um log só de acréscimo ("INI_pontos" por linha); cada
+# processo mantém um heap com as K melhores e lê apenas as linhas novas
+TOP_K = 10
+COMPACT_AFTER = 1000
+
+@contextmanager
+def file_lock(path):
+    with open(path + ".lock", 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def parse_entry(line):
+    try:
+        name, score = line.strip().split("_")
+        return name, int(score)
+    except ValueError:
+        return None
+
+class RankingsStore:
+    def __init__(self, path, k=TOP_K):
+        self.path = path
+        self.k = k
+        self.reset()
+
+    def reset(self):
+        self.heap = []  # (pontos, -ordem, iniciais): o menor é o primeiro a sair
+        self.seq = 0
+        self.lines = 0
+        self.offset = 0
+        self.inode = None
+
+    def push(self, name, score):
+        item = (score, -self.seq, name)
+        self.seq += 1
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, item)
+        elif item > self.heap[0]:
+            heapq.heappushpop(self.heap, item)
+
+    def refresh(self):
+        # lê só o que foi acrescentado desde a última leitura; se o arquivo foi
+        # compactado ou apagado por outro processo, recomeça do zero
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.reset()
+            return
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            self.reset()
+            self.inode = stat.st_ino
+        if stat.st_size == self.offset:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # uma linha pela metade fica para depois
+        for line in data[:end].decode('utf-8').splitlines():
+            entry = parse_entry(line)
+            self.lines += 1
+            if entry is not None:
+                self.push(*entry)
+        self.offset += end
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def top(self):
+        self.refresh()
+        return [(name, score) for score, _, name in sorted(self.heap, reverse=True)]
+
+    def add(self, entry):
+        parsed = parse_entry(entry)
+        if parsed is None:
+            raise ValueError(f"Invalid ranking entry: {entry!r}")
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        with file_lock(self.path):
+            self.refresh()
+            with open(self.path, 'ab') as f:
+                # completa uma linha deixada pela metade por uma gravação interrompida
+                if f.tell() > self.offset:
+                    f.write(b"\r\n")
+                f.write(f"{parsed[0]}_{parsed[1]}\r\n".encode('utf-8'))
+            self.refresh()
+            if self.lines > COMPACT_AFTER:
+                self.compact()
+
+    def compact(self):
+        # reescreve o arquivo só com as K melhores; chamado com o lock
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', newline='', encoding='utf-8') as f:
+            for name, score in self.top():
+                f.write(f"{name}_{score}\r\n")
+        try:
+            os.replace(tmp, self.path)
+        except OSError:
+            os.remove(tmp)
+            return
+        self.reset()
+        self.refresh()
+
+    def clear(self):
+        with file_lock(self.path):
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.reset()
+
+_stores = {}
+
+def get_store(path):
+    key = os.path.abspath(path)
+    if key not in _stores:
+        _stores[key] = RankingsStore(key)
+    return _stores[key]
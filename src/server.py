@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import json
+import logging
+import random
+import secrets
+import sys
+import time
+import difficulty
+import functions
+import session
+
+# servidor HTTP/1.1 com JSON (conexões keep-alive) para muitas partidas
+# simultâneas no mesmo processo, com as mesmas regras de GameSession
+WORDS = "data/words.csv"
+IDLE_TIMEOUT = 600
+MAX_BODY = 4096
+
+STATUS_TEXT = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+               500: "Internal Server Error"}
+logger = logging.getLogger("letreco.server")
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class GameServer:
+    def __init__(self, filepath=WORDS):
+        self.word_list, self.word_set = functions.load_words(filepath)
+        try:
+            self.difficulty_index = difficulty.load_index(filepath)
+        except Exception:
+            self.difficulty_index = None
+        self.rng = random.Random()
+        self.games = {}
+        self.last_seen = {}
+
+    def new_game(self, body):
+        level = body.get("level")
+        if level is not None and (self.difficulty_index is None or level not in difficulty.LEVELS):
+            raise HttpError(400, "Dificuldade inválida.")
+        game = session.GameSession(self.word_list, self.word_set, rng=self.rng,
+                                   difficulty_index=self.difficulty_index, level=level,
+                                   accent_insensitive=bool(body.get("accents", False)))
+        game_id = secrets.token_urlsafe(8)
+        self.games[game_id] = game
+        self.last_seen[game_id] = time.monotonic()
+        return 201, dict(self.state(game), id=game_id)
+
+    def state(self, game):
+        game.check_timeout()
+        state = {
+            "difficulty": game.difficulty(),
+            "attempts_left": game.attempts_left(),
+            "seconds_remaining": game.seconds_remaining(),
+            "finished": game.finished,
+            "won": game.won,
+            "score": game.score,
+        }
+        if game.finished:
+            state["word"] = game.chosen_word
+        return state
+
+    def get_game(self, game_id):
+        game = self.games.get(game_id)
+        if game is None:
+            raise HttpError(404, "Partida não encontrada.")
+        self.last_seen[game_id] = time.monotonic()
+        return game
+
+    def guess(self, game_id, body):
+        game = self.get_game(game_id)
+        user_word = body.get("word")
+        if not isinstance(user_word, str):
+            raise HttpError(400, "Campo 'word' obrigatório.")
+        if game.check_timeout() or game.finished:
+            raise HttpError(409, "A partida já terminou.")
+        error = game.validate(user_word.lower())
+        if error is not None:
+            raise HttpError(400, error)
+        word = game.resolve(user_word)
+        result = game.guess(word)
+        return 200, dict(self.state(game), guess=word, result=result,
+                         pattern=functions.encode_pattern(result))
+
+    def route(self, method, path, body):
+        parts = [part for part in path.split("/") if part]
+        if parts == ["games"] and method == "POST":
+            return self.new_game(body)
+        if len(parts) == 2 and parts[0] == "games":
+            if method == "GET":
+                return 200, self.state(self.get_game(parts[1]))
+            if method == "DELETE":
+                self.get_game(parts[1])
+                del self.games[parts[1]]
+                del self.last_seen[parts[1]]
+                return 200, {}
+        if len(parts) == 3 and parts[0] == "games" and parts[2] == "guess" and method == "POST":
+            return self.guess(parts[1], body)
+        if parts and parts[0] == "games":
+            raise HttpError(405, "Método não permitido.")
+        raise HttpError(404, "Recurso não encontrado.")
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                # sem linha de pedido ou tamanho do corpo válidos não dá para
+                # achar o próximo pedido, então a conexão fecha depois da resposta
+                close = False
+                try:
+                    try:
+                        method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                        length = int(headers.get("content-length", 0))
+                    except ValueError:
+                        close = True
+                        raise HttpError(400, "Requisição inválida.")
+                    if length < 0:
+                        close = True
+                        raise HttpError(400, "Requisição inválida.")
+                    if length > MAX_BODY:
+                        close = True
+                        raise HttpError(413, "Corpo muito grande.")
+                    data = await reader.readexactly(length) if length else b""
+                    body = json.loads(data) if data else {}
+                    if not isinstance(body, dict):
+                        raise HttpError(400, "JSON inválido.")
+                    status, payload = self.route(method, path, body)
+                except HttpError as e:
+                    status, payload = e.status, {"error": e.message}
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    status, payload = 400, {"error": "JSON inválido."}
+                except Exception:
+                    logger.exception("erro ao responder %s", request_line)
+                    status, payload = 500, {"error": "Erro interno."}
+
+                keep_alive = headers.get("connection", "").lower() != "close" and not close
+                self.write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def write_response(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+        )
+
+    async def expire_games(self):
+        # remove partidas abandonadas para a memória não crescer sem limite
+        while True:
+            await asyncio.sleep(IDLE_TIMEOUT / 10)
+            limit = time.monotonic() - IDLE_TIMEOUT
+            for game_id in [g for g, seen in self.last_seen.items() if seen < limit]:
+                del self.games[game_id]
+                del self.last_seen[game_id]
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_client, host, port, backlog=4096)
+        asyncio.create_task(self.expire_games())
+        print(f"Letreco servindo em http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+async def send_raw(reader, writer, data):
+    # pedido cru e status da resposta; None se a conexão fechar sem resposta
+    try:
+        writer.write(data)
+        await writer.drain()
+        status_line = await reader.readline()
+    except ConnectionError:
+        return None, b""
+    if not status_line:
+        return None, b""
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return int(status_line.split()[1]), await reader.readexactly(length)
+
+async def check(filepath):
+    # sonda pedidos malformados e um erro interno num servidor em porta livre
+    game_server = GameServer(filepath)
+    route = game_server.route
+
+    def failing_route(method, path, body):
+        if path == "/falha":
+            raise ValueError("falha de teste")
+        return route(method, path, body)
+    game_server.route = failing_route
+    server = await asyncio.start_server(game_server.handle_client, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    probes = [
+        ("Content-Length inválido", b"POST /games HTTP/1.1\r\nContent-Length: abc\r\n\r\n", 400, True),
+        ("linha de pedido inválida", b"LIXO\r\n\r\n", 400, True),
+        ("corpo com UTF-8 inválido", b"POST /games HTTP/1.1\r\nContent-Length: 2\r\n\r\n\xff\xfe", 400, False),
+        ("erro interno", b"GET /falha HTTP/1.1\r\n\r\n", 500, False),
+    ]
+    failures = 0
+    async with server:
+        for name, data, expected, closes in probes:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            status, _ = await send_raw(reader, writer, data)
+            # depois de um erro que não fecha a conexão ela continua atendendo
+            after, _ = await send_raw(reader, writer, b"GET /games/x HTTP/1.1\r\n\r\n")
+            ok = status == expected and (after is None) == closes and (closes or after == 404)
+            print(f"{name}: {status} (esperado {expected}), conexão {'fechada' if after is None else 'aberta'}"
+                  f"{'' if ok else '  FALHOU'}")
+            failures += not ok
+            writer.close()
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de partidas de Letreco (HTTP + JSON).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--words", default=WORDS)
+    parser.add_argument("--check", action="store_true",
+                        help="confere as respostas 400 e 500 num servidor temporário e sai")
+    args = parser.parse_args(argv)
+    if args.check:
+        logging.disable(logging.ERROR)
+        return 1 if asyncio.run(check(args.words)) else 0
+    try:
+        asyncio.run(GameServer(args.words).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
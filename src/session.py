@@ -0,0 +1,229 @@
+import math
+import random
+import time
+import numpy as np
+import accents
+import difficulty
+import functions
+
+MAX_ATTEMPTS = 6
+TIME_LIMIT = 60
+ADVERSARIAL = "ADVERSÁRIO"
+# modo com várias palavras: uma tentativa e 30 segundos a mais por palavra extra
+BOARD_COUNTS = (2, 4, 8)
+BOARD_EXTRA_TIME = 30
+
+def compute_score(attempts, seconds, boards=1):
+    # mesma escala de 0 a 1000 em todos os modos, já que as pontuações vão
+    # para o mesmo ranking: o tempo é dividido entre as palavras
+    return max(1000 - (attempts - boards) * 100 - seconds * 5 // boards, 0)
+
+class ManualClock:
+    # relógio controlado à mão, para simulações e testes
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+class GameSession:
+    boards = 1
+
+    def __init__(self, word_list, word_set, rng=None, clock=None, chosen_word=None,
+                 difficulty_index=None, level=None, accent_insensitive=False,
+                 adversarial=False, table=None):
+        self.word_list = word_list
+        self.word_set = word_set
+        self.rng = rng if rng is not None else random.Random()
+        self.clock = clock if clock is not None else time.monotonic
+        self.difficulty_index = difficulty_index
+        self.folded_index = accents.get_index(word_list) if accent_insensitive else None
+        if chosen_word is None:
+            if difficulty_index is not None and level is not None:
+                chosen_word = word_list[difficulty_index.choose(level, self.rng)]
+            else:
+                chosen_word = self.rng.choice(word_list)
+        self.chosen_word = chosen_word
+        self.length = len(chosen_word)
+        self._difficulty = None
+        # modo adversário: a palavra secreta é só uma das candidatas que
+        # continuam coerentes com tudo o que já foi mostrado
+        self.adversarial = adversarial
+        self.table = table
+        self.candidates = np.arange(len(word_list)) if adversarial else None
+        if adversarial:
+            self._difficulty = ADVERSARIAL
+        self.attempts = 0
+        self.max_attempts = MAX_ATTEMPTS
+        self.time_limit = TIME_LIMIT
+        self.started_at = None
+        self.ended_at = None
+        self.finished = False
+        self.won = False
+        self.score = None
+
+    def difficulty(self):
+        # usa o índice medido quando existe; senão a heurística por letras
+        if self._difficulty is None:
+            if self.difficulty_index is not None:
+                self._difficulty = self.difficulty_index.level(self.word_list.index(self.chosen_word))
+            else:
+                self._difficulty = functions.classify_difficulty(self.chosen_word)
+        return self._difficulty
+
+    def attempts_left(self):
+        return self.max_attempts - self.attempts
+
+    def elapsed(self):
+        # o tempo só corre depois da primeira tentativa válida
+        if self.started_at is None:
+            return 0.0
+        if self.ended_at is not None:
+            return self.ended_at - self.started_at
+        return self.clock() - self.started_at
+
+    def elapsed_ms(self):
+        return round(self.elapsed() * 1000)
+
+    def remaining_ms(self):
+        # arredonda para cima: zero só quando o tempo acabou de fato
+        return max(math.ceil((self.time_limit - self.elapsed()) * 1000), 0)
+
+    def seconds_remaining(self):
+        return max(self.time_limit - int(self.elapsed()), 0)
+
+    def resolve(self, user_word):
+        # palavra do dicionário que a tentativa representa, ou None
+        user_word = user_word.lower()
+        if self.folded_index is not None:
+            return self.folded_index.resolve(user_word, self.chosen_word)
+        return user_word if user_word in self.word_set else None
+
+    def validate(self, user_word):
+        if len(user_word) != self.length:
+            return f"A palavra deve ter {self.length} letras."
+        if self.resolve(user_word) is None:
+            return "Essa palavra não é válida."
+        return None
+
+    def check_timeout(self):
+        if not self.finished and self.started_at is not None and self.elapsed() >= self.time_limit:
+            self.finished = True
+            self.ended_at = self.started_at + self.time_limit
+        return self.finished and not self.won
+
+    def guess(self, user_word):
+        user_word = user_word.lower()
+        if self.check_timeout() or self.finished:
+            raise ValueError("The game is over.")
+        error = self.validate(user_word)
+        if error is not None:
+            raise ValueError(error)
+        user_word = self.resolve(user_word)
+
+        result = self.evaluate(user_word)
+        self.attempts += 1
+        if self.attempts == 1:
+            self.started_at = self.clock()
+
+        if self.solved_by(user_word):
+            self.won = True
+            self.finish()
+            self.score = compute_score(self.attempts, min(int(self.elapsed()), self.time_limit), self.boards)
+        elif self.attempts >= self.max_attempts:
+            self.finish()
+        return result
+
+    def evaluate(self, user_word):
+        if self.adversarial:
+            return self.adversarial_result(user_word)
+        return functions.check_word(self.chosen_word, user_word)
+
+    def solved_by(self, user_word):
+        return user_word == self.chosen_word
+
+    def adversarial_result(self, user_word):
+        # divide as candidatas pelo padrão que a tentativa daria e fica com o
+        # maior grupo; empates nunca escolhem o acerto
+        guess = self.word_list.index(user_word)
+        if self.table is not None:
+            codes = np.asarray(self.table[guess])[self.candidates]
+        else:
+            matrix = functions.encode_words(self.word_list)
+            codes = functions.pattern_matrix(matrix[guess:guess + 1], matrix[self.candidates])[0]
+        sizes = np.bincount(codes, minlength=functions.n_patterns(self.length)) * 2
+        sizes[functions.all_correct(self.length)] -= 1
+        best = int(np.argmax(sizes))
+        self.candidates = self.candidates[codes == best]
+        self.chosen_word = self.word_list[int(self.candidates[0])]
+        return functions.decode_pattern(best, self.length)
+
+    def finish(self):
+        self.finished = True
+        self.ended_at = self.clock()
+
+class MultiBoardSession(GameSession):
+    # várias palavras secretas ao mesmo tempo; cada tentativa é comparada de
+    # uma vez só (pattern_matrix) com as palavras ainda não acertadas
+    def __init__(self, word_list, word_set, boards=4, rng=None, clock=None, chosen_words=None,
+                 difficulty_index=None, level=None, accent_insensitive=False):
+        rng = rng if rng is not None else random.Random()
+        if chosen_words is None:
+            members = np.arange(len(word_list))
+            if difficulty_index is not None and level is not None:
+                level_members = difficulty_index.members[difficulty.LEVELS.index(level)]
+                # nível com menos palavras que quadros: sorteia no dicionário inteiro
+                if len(level_members) >= boards:
+                    members = level_members
+            if len(members) < boards:
+                raise ValueError(f"The word list has fewer than {boards} words.")
+            chosen_words = [word_list[int(members[i])] for i in rng.sample(range(len(members)), boards)]
+        super().__init__(word_list, word_set, rng=rng, clock=clock, chosen_word=chosen_words[0],
+                         difficulty_index=difficulty_index, accent_insensitive=accent_insensitive)
+        self.boards = len(chosen_words)
+        self.chosen_words = list(chosen_words)
+        # só para mostrar; resolve e evaluate usam chosen_words
+        self.chosen_word = ", ".join(chosen_words)
+        self.targets = functions.encode_words(self.chosen_words)
+        self.solved = np.zeros(self.boards, dtype=bool)
+        self.max_attempts = MAX_ATTEMPTS + self.boards - 1
+        self.time_limit = TIME_LIMIT + BOARD_EXTRA_TIME * (self.boards - 1)
+
+    def difficulty(self):
+        # a mais difícil das palavras
+        if self._difficulty is None:
+            if self.difficulty_index is not None:
+                levels = [self.difficulty_index.level(self.word_list.index(word)) for word in self.chosen_words]
+            else:
+                levels = [functions.classify_difficulty(word) for word in self.chosen_words]
+            self._difficulty = max(levels, key=difficulty.LEVELS.index)
+        return self._difficulty
+
+    def resolve(self, user_word):
+        # sem acentos, uma chave ambígua vale como a palavra de um quadro
+        # ainda aberto, se for uma das variantes
+        user_word = user_word.lower()
+        if self.folded_index is None:
+            return super().resolve(user_word)
+        variants = self.folded_index.variants(user_word)
+        for word, solved in zip(self.chosen_words, self.solved):
+            if not solved and word in variants:
+                return word
+        return self.folded_index.resolve(user_word)
+
+    def evaluate(self, user_word):
+        # código de padrão por palavra; None nas já acertadas antes
+        open_boards = np.flatnonzero(~self.solved)
+        guess = functions.encode_words([user_word])
+        codes = functions.pattern_matrix(guess, self.targets[open_boards])[0]
+        self.solved[open_boards[codes == functions.all_correct(self.length)]] = True
+        result = [None] * self.boards
+        for board, code in zip(open_boards.tolist(), codes.tolist()):
+            result[board] = code
+        return result
+
+    def solved_by(self, user_word):
+        return bool(self.solved.all())
@@ -0,0 +1,163 @@
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import difficulty
+import functions
+import patterns
+import session
+import solver
+
+# roda muitas partidas sem interface, em vários processos, para ajustar a
+# pontuação; cada processo carrega o dicionário e abre a tabela uma vez
+WORDS = "data/words.csv"
+CHUNK_SIZE = 2000
+BOTS = ("random", "candidates", "entropy")
+
+_words = None
+_word_set = None
+_table = None
+_difficulty = None
+_solver = None
+_opening = None
+
+def init_worker(filepath, bot):
+    global _words, _word_set, _table, _difficulty, _solver, _opening
+    _words, _word_set = functions.load_words(filepath)
+    _difficulty = difficulty.load_index(filepath)
+    if bot != "random":
+        _table = np.asarray(patterns.load_table(filepath))
+    if bot == "entropy":
+        _solver = solver.Solver(_table, _words)
+        _opening = _solver.best_index()
+
+def next_guess(bot, rng, candidates, attempt):
+    # índice da próxima tentativa em _words
+    if bot == "random":
+        return rng.randrange(len(_words))
+    if bot == "entropy":
+        if attempt == 0:
+            return _opening
+        return _solver.best_index(candidates)
+    return int(candidates[rng.randrange(len(candidates))])
+
+def play(bot, rng, clock, think_time, script):
+    game = session.GameSession(_words, _word_set, rng=rng, clock=clock, difficulty_index=_difficulty)
+    candidates = np.arange(len(_words))
+    while not game.finished:
+        if game.attempts < len(script):
+            guess = script[game.attempts]
+        else:
+            guess = next_guess(bot, rng, candidates, game.attempts)
+        if game.attempts > 0 and think_time > 0:
+            clock.advance(rng.expovariate(1 / think_time))
+        if game.check_timeout():
+            break
+        result = game.guess(_words[guess])
+        if _table is not None:
+            code = functions.encode_pattern(result)
+            candidates = candidates[_table[guess, candidates] == code]
+    return game
+
+def run_chunk(args):
+    bot, seed, games, think_time, script = args
+    rng = random.Random(seed)
+    script = [_words.index(word) for word in script]
+    clock = session.ManualClock()
+    stats = {}
+    for _ in range(games):
+        game = play(bot, rng, clock, think_time, script)
+        entry = stats.setdefault(game.difficulty(), {
+            "games": 0, "wins": 0, "timeouts": 0, "scores": Counter(), "attempts": Counter()
+        })
+        entry["games"] += 1
+        if game.won:
+            entry["wins"] += 1
+            entry["scores"][game.score] += 1
+            entry["attempts"][game.attempts] += 1
+        elif game.attempts < game.max_attempts:
+            entry["timeouts"] += 1
+    return stats
+
+def merge(total, stats):
+    for level, entry in stats.items():
+        target = total.setdefault(level, {
+            "games": 0, "wins": 0, "timeouts": 0, "scores": Counter(), "attempts": Counter()
+        })
+        for key in ("games", "wins", "timeouts"):
+            target[key] += entry[key]
+        target["scores"].update(entry["scores"])
+        target["attempts"].update(entry["attempts"])
+
+def percentile(counter, q):
+    total = sum(counter.values())
+    if total == 0:
+        return 0
+    seen = 0
+    for value in sorted(counter):
+        seen += counter[value]
+        if seen >= q * total:
+            return value
+    return max(counter)
+
+def report(total, games, elapsed):
+    print(f"{games} partidas em {elapsed:.2f}s ({games / elapsed:,.0f} partidas/s)")
+    for level in difficulty.LEVELS:
+        entry = total.get(level)
+        if entry is None:
+            continue
+        scores = entry["scores"]
+        wins = entry["wins"]
+        mean = sum(score * n for score, n in scores.items()) / wins if wins else 0
+        print(f"\n{level}: {entry['games']} partidas, "
+              f"vitórias {wins / entry['games']:.1%}, tempo esgotado {entry['timeouts'] / entry['games']:.1%}")
+        print(f"  pontuação média {mean:.0f}, p10 {percentile(scores, 0.1)}, "
+              f"p50 {percentile(scores, 0.5)}, p90 {percentile(scores, 0.9)}")
+        buckets = Counter()
+        for score, n in scores.items():
+            buckets[score // 100 * 100] += n
+        for bucket in sorted(buckets, reverse=True):
+            print(f"  {bucket:>4}-{bucket + 99:<4} {buckets[bucket]}")
+        attempts = entry["attempts"]
+        print("  tentativas: " + ", ".join(f"{a}: {attempts[a]}" for a in sorted(attempts)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simula partidas de Letreco em massa.")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--bot", choices=BOTS, default="candidates")
+    parser.add_argument("--script", default="", help="tentativas fixas iniciais, separadas por vírgula")
+    parser.add_argument("--think-time", type=float, default=5.0, help="segundos médios entre tentativas")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--words", default=WORDS)
+    args = parser.parse_args(argv)
+
+    words, word_set = functions.load_words(args.words)
+    script = [word.strip().lower() for word in args.script.split(",") if word.strip()]
+    for word in script:
+        if word not in word_set:
+            parser.error(f"palavra inválida no script: {word}")
+    difficulty.load_index(args.words)
+
+    chunks = []
+    remaining = args.games
+    seed = args.seed
+    while remaining > 0:
+        size = min(CHUNK_SIZE, remaining)
+        chunks.append((args.bot, seed, size, args.think_time, script))
+        remaining -= size
+        seed += 1
+
+    total = {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, initializer=init_worker, initargs=(args.words, args.bot)) as pool:
+        for stats in pool.map(run_chunk, chunks):
+            merge(total, stats)
+    report(total, args.games, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    sys.exit(main())
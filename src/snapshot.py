@@ -0,0 +1,136 @@
+import os
+import struct
+from collections.abc import Sequence, Set
+import numpy as np
+
+# dicionário compilado: palavras de largura fixa (um code point uint32 por letra)
+# na ordem do csv, mais as chaves ordenadas para busca binária; aberto por memory map
+MAGIC = b"LTRC"
+VERSION = 2
+HEADER = struct.Struct("<4sIIIQQ")  # magic, versão, letras, n, tamanho e mtime_ns do csv
+WORD_LENGTH = 5
+
+def snapshot_path(filepath):
+    return os.path.splitext(filepath)[0] + ".snap"
+
+def key_dtype(length):
+    return f"S{length * 4}"
+
+def encode_key(word, length=WORD_LENGTH):
+    # utf-32-be ordena como os code points, então serve de chave de busca
+    if len(word) != length:
+        return None
+    return word.encode("utf-32-be")
+
+def prefix_range(keys, prefix_key):
+    # as chaves com esse prefixo formam o intervalo [início, fim) do array
+    # ordenado; o byte 0xff passa de qualquer continuação (code points < 2^24)
+    start = int(np.searchsorted(keys, prefix_key, side="left"))
+    if len(prefix_key) >= keys.dtype.itemsize:
+        end = int(np.searchsorted(keys, prefix_key, side="right"))
+    else:
+        end = int(np.searchsorted(keys, prefix_key + b"\xff", side="left"))
+    return start, end
+
+class WordList(Sequence):
+    def __init__(self, matrix, order, keys):
+        self.matrix = matrix
+        self.order = order
+        self.keys = keys
+        self.length = matrix.shape[1]
+
+    @classmethod
+    def from_words(cls, words):
+        length = len(words[0]) if len(words) else WORD_LENGTH
+        matrix = np.frombuffer("".join(words).encode("utf-32-le"), dtype="<u4").reshape(-1, length)
+        keys = np.array([encode_key(word, length) for word in words], dtype=key_dtype(length))
+        order = np.argsort(keys, kind="stable").astype("<u4")
+        return cls(matrix, order, keys[order])
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return self.matrix[i].tobytes().decode("utf-32-le")
+
+    def __iter__(self):
+        for row in self.matrix:
+            yield row.tobytes().decode("utf-32-le")
+
+    def __contains__(self, word):
+        return self.find(word) is not None
+
+    def find(self, word):
+        if not isinstance(word, str):
+            return None
+        key = encode_key(word, self.length)
+        if key is None:
+            return None
+        pos = int(np.searchsorted(self.keys, key))
+        if pos < len(self.keys) and self.keys[pos] == key:
+            return int(self.order[pos])
+        return None
+
+    def completions(self, prefix, limit=5):
+        # quantas palavras começam com o prefixo e as primeiras delas
+        if len(prefix) > self.length:
+            return 0, []
+        start, end = prefix_range(self.keys, prefix.encode("utf-32-be"))
+        return end - start, [self[int(i)] for i in self.order[start:min(end, start + limit)]]
+
+    def index(self, word, *args):
+        i = self.find(word)
+        if i is None:
+            raise ValueError(f"{word!r} is not in the word list")
+        return i
+
+class WordSet(Set):
+    def __init__(self, words):
+        self.words = words
+
+    def __contains__(self, word):
+        return self.words.find(word) is not None
+
+    def __len__(self):
+        return len(self.words)
+
+    def __iter__(self):
+        return iter(self.words)
+
+def write_snapshot(words, path, source):
+    word_list = WordList.from_words(words)
+    stat = os.stat(source)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, word_list.length, len(words), stat.st_size, stat.st_mtime_ns))
+        f.write(word_list.matrix.tobytes())
+        f.write(word_list.order.tobytes())
+        f.write(word_list.keys.tobytes())
+    os.replace(tmp, path)
+    return word_list
+
+def open_snapshot(path, source):
+    # devolve None se o arquivo não existe, é de outra versão ou o csv mudou
+    if not os.path.exists(path) or os.path.getsize(path) < HEADER.size:
+        return None
+    with open(path, 'rb') as f:
+        magic, version, length, n, size, mtime = HEADER.unpack(f.read(HEADER.size))
+    stat = os.stat(source)
+    if magic != MAGIC or version != VERSION or (size, mtime) != (stat.st_size, stat.st_mtime_ns):
+        return None
+    key_size = length * 4
+    if os.path.getsize(path) != HEADER.size + n * (key_size + 4 + key_size):
+        return None
+    if n == 0:
+        return None
+
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    start = HEADER.size
+    matrix = data[start:start + n * key_size].view("<u4").reshape(n, length)
+    start += n * key_size
+    order = data[start:start + n * 4].view("<u4")
+    start += n * 4
+    keys = data[start:start + n * key_size].view(key_dtype(length))
+    return WordList(matrix, order, keys)
@@ -0,0 +1,58 @@
+import numpy as np
+import functions
+
+# ranqueia tentativas pelo ganho de informação esperado (entropia da
+# distribuição de padrões) sobre as respostas ainda possíveis
+CHUNK_SIZE = 256
+
+class Solver:
+    def __init__(self, table, words):
+        self.table = table
+        self.words = words
+        self.n_patterns = functions.n_patterns(words.length)
+        self.reset()
+
+    def reset(self):
+        self.candidates = np.arange(len(self.words))
+        self.applied = 0
+
+    def update(self, word, result):
+        # só filtra o conjunto anterior, nunca o dicionário inteiro
+        row = self.table[self.words.index(word)]
+        code = functions.encode_pattern(result)
+        self.candidates = self.candidates[row[self.candidates] == code]
+        self.applied += 1
+
+    def entropies(self, candidates, should_stop=None):
+        m = len(candidates)
+        scores = np.empty(len(self.words))
+        for start in range(0, len(self.words), CHUNK_SIZE):
+            if should_stop is not None and should_stop():
+                return None
+            sub = np.asarray(self.table[start:start + CHUNK_SIZE])[:, candidates]
+            offsets = np.arange(len(sub))[:, None] * self.n_patterns
+            counts = np.bincount((sub + offsets).ravel(), minlength=len(sub) * self.n_patterns)
+            counts = counts.reshape(len(sub), self.n_patterns).astype(np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                weighted = np.where(counts > 0, counts * np.log2(counts), 0.0)
+            scores[start:start + len(sub)] = np.log2(m) - weighted.sum(axis=1) / m
+        return scores
+
+    def best_index(self, candidates=None, should_stop=None):
+        if candidates is None:
+            candidates = self.candidates
+        if len(candidates) == 0:
+            return None
+        if len(candidates) <= 2:
+            return int(candidates[0])
+
+        scores = self.entropies(candidates, should_stop)
+        if scores is None:
+            return None
+        # em caso de empate prefere uma palavra que ainda pode ser a resposta
+        scores[candidates] += 1e-6
+        return int(np.argmax(scores))
+
+    def best_guess(self, candidates=None, should_stop=None):
+        i = self.best_index(candidates, should_stop)
+        return None if i is None else self.words[i]
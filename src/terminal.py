@@ -0,0 +1,150 @@
+import time
+STARTUP = time.perf_counter()
+
+import argparse
+import os
+import random
+import sys
+import functions
+import history
+import rankings
+import session
+
+# versão de terminal do jogo: mesmas regras (GameSession), mesmas palavras e o
+# mesmo rankings.csv, sem importar o Qt; boa para servidores e SSH
+RANKINGS = "data/rankings.csv"
+# orçamento de inicialização medido por --check-budget
+STARTUP_BUDGET_MS = 250
+RSS_BUDGET_MB = 60
+
+COLORS = {
+    "correta": "\033[30;42m",
+    "existe": "\033[30;43m",
+    "inexistente": "\033[30;47m",
+}
+RESET = "\033[0m"
+DIFFICULTY_COLORS = {"FÁCIL": "\033[32m", "MÉDIA": "\033[33m", "DIFÍCIL": "\033[31m", "IMPOSSÍVEL": "\033[35m"}
+MARKS = {"correta": "+", "existe": "?", "inexistente": "-"}
+
+def use_colors():
+    return sys.stdout.isatty() and "NO_COLOR" not in os.environ
+
+def render(word, result, colors):
+    if colors:
+        return "".join(f"{COLORS[status]} {letter.upper()} {RESET}" for letter, status in zip(word, result))
+    # sem cores: a letra e embaixo o status (+ correta, ? existe, - inexistente)
+    return " ".join(word.upper()) + "\n" + " ".join(MARKS[status] for status in result)
+
+def max_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+def ask_initials():
+    while True:
+        initials = input("Digite suas iniciais (3 letras, Enter para não salvar): ").strip().upper()
+        if not initials:
+            return None
+        if len(initials) == 3 and initials.isalpha():
+            return initials
+        print("Por favor, digite exatamente 3 letras.")
+
+def finish_game(game, initials=None):
+    # igual a LetrecoGame.finish_game: histórico com LETRECO_DB, senão rankings.csv
+    store = history.get_store()
+    if store is not None:
+        store.record(game, initials)
+    elif initials:
+        rankings.get_store(RANKINGS).add(f"{initials}_{game.score}")
+
+def play(word_list, word_set, rng, colors, accent_insensitive):
+    game = session.GameSession(word_list, word_set, rng=rng, accent_insensitive=accent_insensitive)
+    level = game.difficulty()
+    if colors:
+        level = f"{DIFFICULTY_COLORS[level]}{level}{RESET}"
+    print(f"\nDificuldade: {level}")
+    while not game.finished:
+        if game.started_at is None:
+            prompt = f"Tentativa {game.attempts + 1}/{game.max_attempts}: "
+        else:
+            prompt = f"Tentativa {game.attempts + 1}/{game.max_attempts} ({game.seconds_remaining()}s): "
+        user_word = input(prompt).strip().lower()
+        if game.check_timeout():
+            break
+        error = game.validate(user_word)
+        if error is not None:
+            print(error)
+            continue
+        user_word = game.resolve(user_word)
+        result = game.guess(user_word)
+        print(render(user_word, result, colors))
+
+    if game.won:
+        print(f"Você acertou em {game.attempts} tentativa(s) e {game.elapsed():.1f}s! Pontuação: {game.score}")
+        finish_game(game, ask_initials())
+    else:
+        reason = "Tempo esgotado! " if game.check_timeout() and game.attempts < game.max_attempts else ""
+        print(f"{reason}A palavra era: {game.chosen_word}")
+        finish_game(game)
+
+def show_rankings():
+    store = history.get_store()
+    if store is not None:
+        entries = [(initials, score) for _, initials, score in store.page(size=rankings.TOP_K)]
+    else:
+        entries = rankings.get_store(RANKINGS).top()
+    if not entries:
+        print("Nenhuma pontuação salva.")
+    for position, (name, score) in enumerate(entries, 1):
+        print(f"{position:>2}. {name} {score}")
+
+def check_budget():
+    # mede do início do processo até as palavras prontas, sem Qt carregado
+    startup_ms = (time.perf_counter() - STARTUP) * 1000
+    rss = max_rss_mb()
+    qt_loaded = any(name.startswith("PyQt5") for name in sys.modules)
+    print(f"inicialização: {startup_ms:.0f} ms (orçamento {STARTUP_BUDGET_MS} ms)")
+    if rss is not None:
+        print(f"memória (RSS máximo): {rss:.1f} MB (orçamento {RSS_BUDGET_MB} MB)")
+    print(f"PyQt5 carregado: {'sim' if qt_loaded else 'não'}")
+    over = startup_ms > STARTUP_BUDGET_MS or (rss is not None and rss > RSS_BUDGET_MB) or qt_loaded
+    return 1 if over else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Letreco no terminal.")
+    parser.add_argument("--length", type=int, default=functions.WORD_LENGTH, choices=functions.WORD_LENGTHS)
+    parser.add_argument("--accents", action="store_true", help="ignorar acentos")
+    parser.add_argument("--rankings", action="store_true", help="mostra as melhores pontuações e sai")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--check-budget", action="store_true",
+                        help="mede o tempo de inicialização e a memória e sai")
+    args = parser.parse_args()
+
+    try:
+        word_list, word_set = functions.load_words(functions.dictionary_path(args.length))
+    except (OSError, ValueError):
+        print("Erro ao carregar a lista de palavras.", file=sys.stderr)
+        return 1
+    if args.check_budget:
+        return check_budget()
+    if args.rankings:
+        show_rankings()
+        return 0
+
+    rng = random.Random(args.seed)
+    colors = use_colors()
+    try:
+        while True:
+            play(word_list, word_set, rng, colors, args.accents)
+            if input("\nJogar de novo? (S/n) ").strip().lower() not in ("", "s", "sim"):
+                return 0
+    except (EOFError, KeyboardInterrupt):
+        print()
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
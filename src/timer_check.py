@@ -0,0 +1,106 @@
+import argparse
+import os
+import random
+import shutil
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
+from PyQt5.QtCore import QTimer, QEventLoop
+import main
+from gui_bench import work_folder
+
+# joga partidas na janela real com o laço de eventos travado por pausas
+# aleatórias e compara o tempo medido pela sessão com o relógio de parede
+
+def type_word(game, word):
+    # instantes de parede logo antes e logo depois da tentativa
+    for field, letter in zip(game.input_fields, word):
+        field.setText(letter)
+    before = time.time()
+    game.check_input()
+    return before, time.time()
+
+def run_loaded(app, seconds, max_block, rng, until=None):
+    # um QTimer de intervalo zero trava o laço por até max_block ms a cada volta
+    load = QTimer()
+    load.timeout.connect(lambda: time.sleep(rng.uniform(0, max_block) / 1000))
+    load.start(0)
+    deadline = time.time() + seconds
+    while time.time() < deadline and not (until and until()):
+        app.processEvents(QEventLoop.AllEvents, 50)
+    load.stop()
+
+def first_guess(game):
+    word = next(w for w in game.word_list if w != game.session.chosen_word)
+    return word, type_word(game, word)
+
+def check_win(app, game, seconds, max_block, rng):
+    played = game.session
+    _, started = first_guess(game)
+    run_loaded(app, seconds, max_block, rng)
+    ended = type_word(game, played.chosen_word)
+    # o tempo da sessão tem que cair entre o menor e o maior intervalo possível
+    shortest = (ended[0] - started[1]) * 1000
+    longest = (ended[1] - started[0]) * 1000
+    return played.won, shortest, longest, played.elapsed() * 1000
+
+def check_timeout(app, game, limit, max_block, rng):
+    played = game.session
+    played.time_limit = limit
+    _, (started, _) = first_guess(game)
+    run_loaded(app, limit + 5, max_block, rng, until=lambda: played.finished)
+    detected = time.time()
+    return played.finished and not played.won, (detected - started) * 1000 - limit * 1000, played.elapsed() * 1000
+
+def main_check():
+    parser = argparse.ArgumentParser(description="Confere o temporizador com o laço de eventos sobrecarregado.")
+    parser.add_argument("--duration", type=float, default=5.0, help="segundos de carga antes do acerto")
+    parser.add_argument("--block", type=float, default=400, help="pausa máxima do laço de eventos, em ms")
+    parser.add_argument("--time-limit", type=int, default=3, help="limite de tempo na partida que esgota")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # as partidas rodam numa pasta temporária, sem gravar no log de eventos
+    # nem no histórico do jogador
+    source = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    folder = work_folder(source)
+    os.environ.pop("LETRECO_DB", None)
+    os.chdir(folder)
+    try:
+        failures = run_checks(args)
+    finally:
+        os.chdir(source)
+        shutil.rmtree(folder, ignore_errors=True)
+    print("ok" if not failures else f"{failures} verificação(ões) falharam")
+    sys.exit(1 if failures else 0)
+
+def run_checks(args):
+    app = QApplication(sys.argv[:1])
+    # diálogos modais travariam o teste
+    QMessageBox.information = staticmethod(lambda *a, **k: None)
+    main.ScoreDialog.exec_ = lambda self: QDialog.Rejected
+    rng = random.Random(args.seed)
+    game = main.LetrecoGame()
+    game.show()
+    failures = 0
+
+    won, shortest, longest, measured_ms = check_win(app, game, args.duration, args.block, rng)
+    print(f"vitória: sessão {measured_ms:.1f} ms, parede entre {shortest:.1f} e {longest:.1f} ms")
+    if not won or not shortest - 1 <= measured_ms <= longest + 1:
+        failures += 1
+
+    lost, late_ms, measured_ms = check_timeout(app, game, args.time_limit, args.block, rng)
+    print(f"tempo esgotado: sessão {measured_ms:.1f} ms (limite {args.time_limit * 1000} ms), "
+          f"detectado {late_ms:+.1f} ms depois do limite (pausa máxima {args.block:.0f} ms)")
+    # o limite pode vencer logo no começo de uma pausa e o próximo tick cair
+    # em outra, então até duas pausas seguidas de atraso são legítimas
+    if not lost or abs(measured_ms - args.time_limit * 1000) > 1 or late_ms > 2 * args.block + 50:
+        failures += 1
+    game.close()
+    return failures
+
+if __name__ == "__main__":
+    main_check()